@@ -0,0 +1,53 @@
+"""Add user rating aggregates
+
+Revision ID: 3b7e1c9a4d52
+Revises: fc054c0a6bbc
+Create Date: 2026-10-18 09:12:41.530114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e1c9a4d52'
+down_revision: Union[str, Sequence[str], None] = 'fc054c0a6bbc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGGREGATE_COLUMNS = ('rating_sum', 'rating_count', 'positive_count', 'neutral_count', 'negative_count')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in AGGREGATE_COLUMNS:
+        op.add_column('users', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing feedback in one set-based statement
+    op.execute("""
+        UPDATE users
+        SET rating_sum = agg.rating_sum,
+            rating_count = agg.rating_count,
+            positive_count = agg.positive_count,
+            neutral_count = agg.neutral_count,
+            negative_count = agg.negative_count
+        FROM (
+            SELECT receiver_id,
+                   SUM(rating) AS rating_sum,
+                   COUNT(*) AS rating_count,
+                   SUM(CASE WHEN overall_sentiment = 'POSITIVE' THEN 1 ELSE 0 END) AS positive_count,
+                   SUM(CASE WHEN overall_sentiment = 'NEUTRAL' THEN 1 ELSE 0 END) AS neutral_count,
+                   SUM(CASE WHEN overall_sentiment = 'NEGATIVE' THEN 1 ELSE 0 END) AS negative_count
+            FROM feedback
+            GROUP BY receiver_id
+        ) AS agg
+        WHERE users.id = agg.receiver_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(AGGREGATE_COLUMNS):
+        op.drop_column('users', column)
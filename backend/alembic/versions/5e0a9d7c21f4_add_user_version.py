@@ -0,0 +1,28 @@
+"""Add user version counter
+
+Revision ID: 5e0a9d7c21f4
+Revises: 8d24f0b6e913
+Create Date: 2026-10-18 14:03:55.684210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a9d7c21f4'
+down_revision: Union[str, Sequence[str], None] = '8d24f0b6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'version')
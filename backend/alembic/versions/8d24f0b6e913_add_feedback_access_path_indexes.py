@@ -0,0 +1,38 @@
+"""Add feedback access path indexes
+
+Revision ID: 8d24f0b6e913
+Revises: 3b7e1c9a4d52
+Create Date: 2026-10-18 11:40:07.218843
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d24f0b6e913'
+down_revision: Union[str, Sequence[str], None] = '3b7e1c9a4d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_feedback_receiver_created', 'feedback', ['receiver_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_feedback_giver_created', 'feedback', ['giver_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_feedback_receiver_unacknowledged', 'feedback', ['receiver_id', 'created_at', 'id'], unique=False,
+        postgresql_where=sa.text('NOT is_acknowledged'),
+        sqlite_where=sa.text('is_acknowledged = 0'),
+    )
+    op.create_index('ix_users_manager_role', 'users', ['manager_id', 'role'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_manager_role', table_name='users')
+    op.drop_index('ix_feedback_receiver_unacknowledged', table_name='feedback')
+    op.drop_index('ix_feedback_giver_created', table_name='feedback')
+    op.drop_index('ix_feedback_receiver_created', table_name='feedback')
@@ -0,0 +1,64 @@
+"""Add feedback full-text search
+
+Revision ID: b4c19e7f0a36
+Revises: 5e0a9d7c21f4
+Create Date: 2026-10-18 17:22:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c19e7f0a36'
+down_revision: Union[str, Sequence[str], None] = '5e0a9d7c21f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # The generated column is computed for existing rows as part of the ALTER
+        op.execute(
+            "ALTER TABLE feedback ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(strengths, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(areas_to_improve, '')), 'B')) STORED"
+        )
+        op.create_index('ix_feedback_search', 'feedback', ['search_vector'], unique=False, postgresql_using='gin')
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE feedback_fts USING fts5("
+            "strengths, areas_to_improve, content='feedback', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER feedback_fts_ai AFTER INSERT ON feedback BEGIN "
+            "INSERT INTO feedback_fts(rowid, strengths, areas_to_improve) VALUES (new.id, new.strengths, new.areas_to_improve); END"
+        )
+        op.execute(
+            "CREATE TRIGGER feedback_fts_ad AFTER DELETE ON feedback BEGIN "
+            "INSERT INTO feedback_fts(feedback_fts, rowid, strengths, areas_to_improve) "
+            "VALUES ('delete', old.id, old.strengths, old.areas_to_improve); END"
+        )
+        op.execute(
+            "CREATE TRIGGER feedback_fts_au AFTER UPDATE OF strengths, areas_to_improve ON feedback BEGIN "
+            "INSERT INTO feedback_fts(feedback_fts, rowid, strengths, areas_to_improve) "
+            "VALUES ('delete', old.id, old.strengths, old.areas_to_improve); "
+            "INSERT INTO feedback_fts(rowid, strengths, areas_to_improve) VALUES (new.id, new.strengths, new.areas_to_improve); END"
+        )
+        op.execute("INSERT INTO feedback_fts(feedback_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_feedback_search', table_name='feedback')
+        op.drop_column('feedback', 'search_vector')
+    elif dialect == 'sqlite':
+        for trigger in ('feedback_fts_au', 'feedback_fts_ad', 'feedback_fts_ai'):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE feedback_fts")
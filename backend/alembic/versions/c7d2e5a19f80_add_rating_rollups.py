@@ -0,0 +1,62 @@
+"""Add rating rollups
+
+Revision ID: c7d2e5a19f80
+Revises: b4c19e7f0a36
+Create Date: 2026-10-18 18:04:12.318540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e5a19f80'
+down_revision: Union[str, Sequence[str], None] = 'b4c19e7f0a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BUCKETS = {
+    'postgresql': {
+        'day': "date_trunc('day', created_at AT TIME ZONE 'UTC')::date",
+        'week': "date_trunc('week', created_at AT TIME ZONE 'UTC')::date",
+    },
+    'sqlite': {
+        'day': "date(created_at)",
+        'week': "date(created_at, 'weekday 0', '-6 days')",
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rating_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('grain', sa.String(length=8), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('positive_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('neutral_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('negative_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'grain', 'period_start'),
+    )
+    # Backfill from existing feedback; later writes keep the rollups in step
+    for grain, bucket in _BUCKETS[op.get_bind().dialect.name].items():
+        op.execute(
+            "INSERT INTO rating_rollups (user_id, grain, period_start, rating_sum, rating_count, "
+            "positive_count, neutral_count, negative_count) "
+            f"SELECT receiver_id, '{grain}', {bucket}, SUM(rating), COUNT(*), "
+            "SUM(CASE WHEN overall_sentiment = 'POSITIVE' THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN overall_sentiment = 'NEUTRAL' THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN overall_sentiment = 'NEGATIVE' THEN 1 ELSE 0 END) "
+            f"FROM feedback GROUP BY receiver_id, {bucket}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rating_rollups')
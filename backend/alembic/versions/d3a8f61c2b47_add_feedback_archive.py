@@ -0,0 +1,54 @@
+"""Add feedback archive
+
+Revision ID: d3a8f61c2b47
+Revises: c7d2e5a19f80
+Create Date: 2026-10-18 19:12:55.604317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f61c2b47'
+down_revision: Union[str, Sequence[str], None] = 'c7d2e5a19f80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'feedback_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('giver_id', sa.Integer(), nullable=False),
+        sa.Column('receiver_id', sa.Integer(), nullable=False),
+        sa.Column('strengths', sa.Text(), nullable=False),
+        sa.Column('areas_to_improve', sa.Text(), nullable=False),
+        # The type already exists for feedback
+        sa.Column('overall_sentiment', postgresql.ENUM('POSITIVE', 'NEUTRAL', 'NEGATIVE', name='feedbacksentiment', create_type=False), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('is_acknowledged', sa.Boolean(), nullable=True),
+        sa.Column('acknowledged_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['giver_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['receiver_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_feedback_archive_receiver_created', 'feedback_archive', ['receiver_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_feedback_archive_giver_created', 'feedback_archive', ['giver_id', 'created_at', 'id'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        # Compress (pglz) nearly every archived row's text in place, not only rows past ~2kB
+        op.execute("ALTER TABLE feedback_archive SET (toast_tuple_target = 128)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_feedback_archive_giver_created', table_name='feedback_archive')
+    op.drop_index('ix_feedback_archive_receiver_created', table_name='feedback_archive')
+    op.drop_table('feedback_archive')
@@ -0,0 +1,28 @@
+"""Add feedback archive created_at index
+
+Revision ID: f4a1c8e2d9b3
+Revises: d3a8f61c2b47
+Create Date: 2026-10-18 22:15:06.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a1c8e2d9b3'
+down_revision: Union[str, Sequence[str], None] = 'd3a8f61c2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_feedback_archive_created', 'feedback_archive', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_feedback_archive_created', table_name='feedback_archive')
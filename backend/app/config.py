@@ -4,9 +4,100 @@ import os
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional explicit async URL; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Connection pool, applied per engine in each worker process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Optional read replicas (comma-separated URLs, same form as DATABASE_URL).
+# Read-only routes spread across them round-robin; unset means everything uses the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# A replica that fails to connect is skipped (reads go to the primary) for this long
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+DB_REPLICA_CONNECT_TIMEOUT = float(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", "2"))
+# Users whose data just changed read from the primary for this long, covering replica lag
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
+# Startup: migrations are the source of truth; create_all is a dev convenience
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+# What to do when the database isn't at the Alembic head: off, warn or strict (refuse to start)
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "warn").lower()
+# Connections opened per worker before serving, so the first requests don't pay for them
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", "1"))
 
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = "HS256"
 
+# Usernames allowed org-wide operations such as full feedback exports
+ADMIN_USERNAMES = {name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip()}
+
+# Feedback list pagination
+FEEDBACK_PAGE_SIZE = int(os.getenv("FEEDBACK_PAGE_SIZE", "50"))
+FEEDBACK_MAX_PAGE_SIZE = int(os.getenv("FEEDBACK_MAX_PAGE_SIZE", "200"))
+# Upper bound on items per POST /api/feedback/bulk
+FEEDBACK_BULK_MAX_ITEMS = int(os.getenv("FEEDBACK_BULK_MAX_ITEMS", "100"))
+# Rows fetched per round trip by streaming exports
+FEEDBACK_EXPORT_BATCH_SIZE = int(os.getenv("FEEDBACK_EXPORT_BATCH_SIZE", "1000"))
+
+# Acknowledged feedback older than this many days is moved to feedback_archive by
+# scripts/archive_feedback.py, and list routes read the archive only for pages that
+# reach that far back (or past the newest archived row). 0 disables archiving;
+# rows already archived stay readable
+FEEDBACK_ARCHIVE_AFTER_DAYS = int(os.getenv("FEEDBACK_ARCHIVE_AFTER_DAYS", "0"))
+
+# Negotiated gzip (or brotli, when installed) for response bodies at least this large; -1 disables
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+
+# Password hashing
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Size of the per-worker process pool that runs bcrypt off the request path
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Hash/verify jobs allowed in flight or queued before new ones get a 429
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+# New jobs also get a 429 once the projected queue wait (pending jobs per
+# worker times the measured job time) exceeds this many seconds; 0 disables
+PASSWORD_HASH_MAX_WAIT_SECONDS = float(os.getenv("PASSWORD_HASH_MAX_WAIT_SECONDS", "2"))
+
+# Sign-in throttling: token buckets refilled at this many attempts per minute
+# (also the burst size), per client IP and per username; 0 disables a limit.
+# Shared through Redis when REDIS_URL is set, otherwise enforced per worker
+LOGIN_RATE_PER_IP = int(os.getenv("LOGIN_RATE_PER_IP", "60"))
+LOGIN_RATE_PER_USERNAME = int(os.getenv("LOGIN_RATE_PER_USERNAME", "10"))
+REGISTER_RATE_PER_IP = int(os.getenv("REGISTER_RATE_PER_IP", "10"))
+
+# Authenticated principal cache (see app/services/principal_cache.py)
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+# Per-manager team analytics cache; updated incrementally by feedback writes
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300"))
+ANALYTICS_CACHE_MAX_TEAMS = int(os.getenv("ANALYTICS_CACHE_MAX_TEAMS", "1000"))
+
+# Server-sent notification streams, per worker process
+NOTIFY_MAX_CONNECTIONS = int(os.getenv("NOTIFY_MAX_CONNECTIONS", "5000"))
+NOTIFY_MAX_PER_USER = int(os.getenv("NOTIFY_MAX_PER_USER", "5"))
+# Events buffered for a slow client before it is told to resync instead
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", "100"))
+# Comment lines sent on idle streams so proxies and dead clients are noticed
+NOTIFY_HEARTBEAT_SECONDS = float(os.getenv("NOTIFY_HEARTBEAT_SECONDS", "25"))
+# Streams are closed after this long and the browser reconnects, so deploys
+# and worker restarts are never held open by idle dashboards
+NOTIFY_MAX_STREAM_SECONDS = float(os.getenv("NOTIFY_MAX_STREAM_SECONDS", "600"))
+
+# Optional Redis for state shared between uvicorn workers; in-process when unset
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Log statements slower than this many milliseconds, with the route that issued them; off when unset
+SLOW_QUERY_MS = float(os.environ["SLOW_QUERY_MS"]) if os.getenv("SLOW_QUERY_MS") else None
+
+# Shared secret for /api/internal/* and /metrics (sent as X-Internal-Token or a
+# bearer token); those routes 404 when unset
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
 
+# Deepest reporting chain followed by org hierarchy queries
+ORG_MAX_DEPTH = int(os.getenv("ORG_MAX_DEPTH", "32"))
@@ -1,17 +1,145 @@
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app import config
+from app.config import DATABASE_URL, ASYNC_DATABASE_URL
+from app.utils import pool_stats
+
+# Async drivers for the request path; the sync engine below stays for
+# migrations, schema creation and offline scripts
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def pool_options(url: str, base_pool: type, metrics: pool_stats.PoolMetrics) -> dict:
+    # In-memory SQLite needs its single shared connection; sizing doesn't apply
+    if make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": pool_stats.instrumented_pool_class(base_pool, metrics),
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
 
+
+_sync_metrics = pool_stats.PoolMetrics()
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+    **pool_options(DATABASE_URL, QueuePool, _sync_metrics),
 )
+pool_stats.register("sync", engine, _sync_metrics)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+_async_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+_async_metrics = pool_stats.PoolMetrics()
+async_engine = create_async_engine(_async_url, **pool_options(_async_url, AsyncAdaptedQueuePool, _async_metrics))
+pool_stats.register("primary", async_engine.sync_engine, _async_metrics)
+# Objects stay usable after commit; attribute refreshes would otherwise need
+# implicit IO, which AsyncSession does not allow
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        async_url = to_async_url(url)
+        metrics = pool_stats.PoolMetrics()
+        # A replica that is down must fail fast so the request can fall back
+        connect_args = {"timeout": config.DB_REPLICA_CONNECT_TIMEOUT} if make_url(async_url).get_backend_name() == "postgresql" else {}
+        self.engine = create_async_engine(
+            async_url, connect_args=connect_args, **pool_options(async_url, AsyncAdaptedQueuePool, metrics)
+        )
+        pool_stats.register(name, self.engine.sync_engine, metrics)
+        self.sessions = async_sessionmaker(self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        self.down_until = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class ReplicaSet:
+    """
+    Read-only sessions spread round-robin over the configured replicas. A
+    replica that fails to connect sits out for DB_REPLICA_RETRY_SECONDS and
+    its reads fall back to the next replica, then to the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica-{index}", url) for index, url in enumerate(urls)]
+        self._order = itertools.count()
+        self.primary_reads = 0
+
+    def _candidates(self) -> List[Replica]:
+        if not self.replicas:
+            return []
+        start = next(self._order) % len(self.replicas)
+        now = time.monotonic()
+        rotated = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in rotated if replica.down_until <= now]
+
+    @asynccontextmanager
+    async def session(self, primary: bool = False) -> AsyncIterator[AsyncSession]:
+        for replica in [] if primary else self._candidates():
+            db = replica.sessions()
+            try:
+                # Connect up front: failing here can still fall back, failing mid-route can't
+                await db.connection()
+            except (DBAPIError, OSError, asyncio.TimeoutError):
+                await db.close()
+                replica.failures += 1
+                replica.down_until = time.monotonic() + config.DB_REPLICA_RETRY_SECONDS
+                continue
+            replica.reads += 1
+            async with db:
+                yield db
+            return
+
+        self.primary_reads += 1
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    @property
+    def engines(self) -> list:
+        return [replica.engine for replica in self.replicas]
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "primary_reads": self.primary_reads,
+            "replicas": {
+                replica.name: {
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                    "down_for_seconds": round(max(0.0, replica.down_until - now), 1),
+                }
+                for replica in self.replicas
+            },
+        }
+
+
+replicas = ReplicaSet(config.DATABASE_REPLICA_URLS)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,29 +1,99 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
 import os
-import dotenv
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine
-from app import models
-from app.routers import auth_routes,user_routes, feedback_routes
+from sqlalchemy import text
+from app import config, models
+from app.database import async_engine, replicas
+from app.middleware.compression import CompressionMiddleware
+from app.routers import auth_routes,user_routes, feedback_routes, internal_routes, analytics_routes, notification_routes
+from app.services.notifications import notifications
+from app.utils import migrations, security
+from app.utils.metrics import MetricsMiddleware, registry
+
+logger = logging.getLogger(__name__)
+
+
+async def prepare_schema() -> None:
+    if config.DB_CREATE_ALL:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        return
+    if config.SCHEMA_CHECK == "off":
+        return
+
+    heads = migrations.head_revisions()
+    if heads is None:
+        logger.warning("alembic.ini not found next to the app; skipping the schema revision check")
+        return
+    current = await migrations.database_revisions(async_engine)
+    if current != heads:
+        message = f"Database is at revision {sorted(current) or 'none'}, expected {sorted(heads)}; run `alembic upgrade head`"
+        if config.SCHEMA_CHECK == "strict":
+            raise RuntimeError(message)
+        logger.warning(message)
+
+
+async def warm_pool(connections: int) -> None:
+    async def checkout() -> None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Held concurrently, so the pool keeps that many open connections afterwards
+    await asyncio.gather(*(checkout() for _ in range(connections)))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await prepare_schema()
+    await warm_pool(config.DB_POOL_WARMUP)
+    registry.cold_start.ready = time.perf_counter()
+    logger.info("Ready to serve in %.3fs", registry.cold_start.ready - registry.cold_start.started)
+    try:
+        yield
+    finally:
+        security.shutdown_hash_pool()
+        await notifications.close()
+        await async_engine.dispose()
+        for replica_engine in replicas.engines:
+            await replica_engine.dispose()
+
 
-dotenv.load_dotenv()
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
 
-models.Base.metadata.create_all(bind=engine)
+    origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
 
-app = FastAPI()
+    print(f"Allowed origins: {origins}")
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Archive-Excluded"],
+    )
+    if config.RESPONSE_COMPRESSION_MIN_BYTES >= 0:
+        app.add_middleware(CompressionMiddleware, minimum_size=config.RESPONSE_COMPRESSION_MIN_BYTES)
+    # Outermost, so latency covers CORS handling and every other middleware
+    app.add_middleware(MetricsMiddleware)
 
-origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
+    # 👇 Register auth routes
+    app.include_router(auth_routes.router)
+    app.include_router(user_routes.router)
+    app.include_router(feedback_routes.router)
+    app.include_router(analytics_routes.router)
+    app.include_router(notification_routes.router)
+    app.include_router(internal_routes.router)
+    app.include_router(internal_routes.metrics_router)
+    return app
 
-print(f"Allowed origins: {origins}")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# 👇 Register auth routes
-app.include_router(auth_routes.router)
-app.include_router(user_routes.router)
-app.include_router(feedback_routes.router)
\ No newline at end of file
+registry.cold_start.started = _import_started
+app = create_app()
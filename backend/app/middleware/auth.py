@@ -1,10 +1,32 @@
-from fastapi import Request, HTTPException, Depends
+from typing import Optional
+
+from fastapi import Request, HTTPException, Depends, Header
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import config, models
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
+from app.services.principal_cache import principal_cache
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> models.User:
+    return await authenticate_request(request, db)
+
+async def get_optional_user(request: Request, db: AsyncSession = Depends(get_db)) -> Optional[models.User]:
+    # For routes signed-out visitors can also use (the sign-up form's manager list)
+    if not request.cookies.get("access_token"):
+        return None
+    try:
+        return await authenticate_request(request, db)
+    except HTTPException:
+        return None
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.User:
+async def get_streaming_user(request: Request) -> models.User:
+    # Long-lived responses resolve the user with a session closed before the
+    # stream starts, so an open connection never pins a pooled DB connection
+    async with AsyncSessionLocal() as db:
+        return await authenticate_request(request, db)
+
+async def authenticate_request(request: Request, db: AsyncSession) -> models.User:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -15,18 +37,39 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = await principal_cache.get(username)
+    if user is not None:
+        return user
+
+    user = await db.scalar(select(models.User).where(models.User.username == username))
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    await principal_cache.put(user)
     return user
 
-def get_manager_user(current_user: models.User = Depends(get_current_user)) -> models.User:
+def is_admin(user: models.User) -> bool:
+    return user.username in config.ADMIN_USERNAMES
+
+async def get_manager_user(current_user: models.User = Depends(get_current_user)) -> models.User:
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Only managers can perform this action")
     return current_user
 
-def get_developer_user(current_user: models.User = Depends(get_current_user)) -> models.User:
+async def get_developer_user(current_user: models.User = Depends(get_current_user)) -> models.User:
     if current_user.role != "developer":
         raise HTTPException(status_code=403, detail="Only developers can perform this action")
     return current_user
+
+async def require_internal_token(
+    x_internal_token: str | None = Header(None),
+    authorization: str | None = Header(None),
+) -> None:
+    # Operational endpoints stay invisible unless a token is configured
+    if not config.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    # Prometheus scrape configs can only send the token as a bearer credential
+    if authorization and authorization.startswith("Bearer "):
+        x_internal_token = x_internal_token or authorization[len("Bearer "):]
+    if x_internal_token != config.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid internal token")
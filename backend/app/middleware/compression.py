@@ -0,0 +1,124 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Never compressed: event streams (each event must reach the browser as it is
+# sent, not sit in a compressor) and formats that are compressed already
+_SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "application/gzip", "application/zip")
+
+# Dynamic responses favour speed over ratio; both still shrink JSON lists ~10x
+_GZIP_LEVEL = 6
+_BROTLI_QUALITY = 4
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + (self._compressor.flush() if final else self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=_BROTLI_QUALITY)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+_ENCODERS = {"br": _BrotliEncoder, "gzip": _GzipEncoder} if brotli else {"gzip": _GzipEncoder}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best supported coding the client accepts: br, then gzip."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in _ENCODERS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI, negotiated gzip/brotli. Whole bodies below `minimum_size` go
+    out as they are; streamed bodies (exports) are compressed chunk by chunk
+    with a flush after each, so they keep streaming.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None
+
+        async def send_compressed(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Held until the first body chunk shows whether compression pays off
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or content_type.startswith(_SKIP_CONTENT_TYPES):
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                encoder = _ENCODERS[coding]()
+                headers["Content-Encoding"] = coding
+                body = encoder.encode(body, final=not more_body)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            if encoder is not None:
+                message = {"type": "http.response.body", "body": encoder.encode(body, final=not more_body), "more_body": more_body}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
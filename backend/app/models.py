@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Date, DateTime, Boolean, Float, Numeric, Index, Enum as SQLEnum, DDL, case, cast, event, text
 from sqlalchemy.orm import relationship
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from sqlalchemy.ext.hybrid import hybrid_property
 from enum import Enum
@@ -20,6 +21,10 @@ class FeedbackSentiment(str, Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # get_my_team and role-filtered team lookups
+        Index("ix_users_manager_role", "manager_id", "role"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
@@ -37,18 +42,47 @@ class User(Base):
     feedback_given = relationship("Feedback", foreign_keys="Feedback.giver_id", back_populates="giver")
     feedback_received = relationship("Feedback", foreign_keys="Feedback.receiver_id", back_populates="receiver")
 
+    # Running rating aggregates over feedback_received, kept in step by
+    # app.services.ratings so that reading a rating never loads feedback rows
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    positive_count = Column(Integer, nullable=False, default=0, server_default="0")
+    neutral_count = Column(Integer, nullable=False, default=0, server_default="0")
+    negative_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Bumped whenever this row or the feedback this user received changes;
+    # list endpoints derive their ETags from it (app.services.versions)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Average rating
     @hybrid_property
     def average_rating(self):
-        if not self.feedback_received:
+        if not self.rating_count:
             return None
-        total = sum(f.rating for f in self.feedback_received if f.rating is not None)
-        count = len([f for f in self.feedback_received if f.rating is not None])
-        return round(total / count, 2) if count > 0 else None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    @average_rating.expression
+    def average_rating(cls):
+        return case(
+            (cls.rating_count > 0, func.round(cast(cast(cls.rating_sum, Float) / cls.rating_count, Numeric), 2)),
+            else_=None,
+        )
 
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        # Keyset-paginated list routes: filter on one side, order by (created_at, id)
+        Index("ix_feedback_receiver_created", "receiver_id", "created_at", "id"),
+        Index("ix_feedback_giver_created", "giver_id", "created_at", "id"),
+        # Pending-acknowledgement lookups only ever touch the unacknowledged rows
+        Index(
+            "ix_feedback_receiver_unacknowledged",
+            "receiver_id", "created_at", "id",
+            postgresql_where=text("NOT is_acknowledged"),
+            sqlite_where=text("is_acknowledged = 0"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     giver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -62,8 +96,104 @@ class Feedback(Base):
     is_acknowledged = Column(Boolean, default=False)
     acknowledged_at = Column(DateTime(timezone=True), nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # SQLite's CURRENT_TIMESTAMP has whole-second precision; bind values in the
+    # same format so (created_at, id) keyset comparisons line up locally
+    created_at = Column(
+        DateTime(timezone=True).with_variant(
+            sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+            "sqlite",
+        ),
+        server_default=func.now(),
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     giver = relationship("User", foreign_keys=[giver_id], back_populates="feedback_given")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="feedback_received")
+
+
+
+
+class FeedbackArchive(Base):
+    """
+    Acknowledged feedback moved out of `feedback` once it is older than
+    FEEDBACK_ARCHIVE_AFTER_DAYS (see app/services/feedback_archive.py). Same
+    columns and ids, read-only; list routes only reach it for older pages.
+    """
+    __tablename__ = "feedback_archive"
+    __table_args__ = (
+        Index("ix_feedback_archive_receiver_created", "receiver_id", "created_at", "id"),
+        Index("ix_feedback_archive_giver_created", "giver_id", "created_at", "id"),
+        # The newest archived row bounds which pages read the archive at all
+        Index("ix_feedback_archive_created", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    giver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    receiver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    strengths = Column(Text, nullable=False)
+    areas_to_improve = Column(Text, nullable=False)
+    overall_sentiment = Column(SQLEnum(FeedbackSentiment), nullable=False)
+    rating = Column(Integer, nullable=False)
+
+    is_acknowledged = Column(Boolean, default=True)
+    acknowledged_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(Feedback.__table__.c.created_at.type, nullable=False)
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Postgres only compresses rows past ~2kB by default; a 128-byte target makes
+# it compress (pglz) nearly every archived row's text in place
+event.listen(
+    FeedbackArchive.__table__,
+    "after_create",
+    DDL("ALTER TABLE feedback_archive SET (toast_tuple_target = 128)").execute_if(dialect="postgresql"),
+)
+
+class RatingRollup(Base):
+    """
+    A receiver's rating and sentiment totals per UTC day and per ISO week,
+    kept in step with feedback writes by app/services/rollups.py. Trend
+    charts read these instead of scanning feedback.
+    """
+    __tablename__ = "rating_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    grain = Column(String(8), primary_key=True)  # "day" or "week"
+    period_start = Column(Date, primary_key=True)  # the day, or the Monday the week starts on
+
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    positive_count = Column(Integer, nullable=False, default=0, server_default="0")
+    neutral_count = Column(Integer, nullable=False, default=0, server_default="0")
+    negative_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+# Full-text search over strengths/areas_to_improve (see app/services/feedback_search.py).
+# Postgres keeps a generated tsvector column with a GIN index; SQLite keeps an
+# external-content FTS5 table in sync through triggers. Neither is mapped on the
+# model, so both stay current on every insert/update without ORM involvement.
+FEEDBACK_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE feedback ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(strengths, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(areas_to_improve, '')), 'B')) STORED",
+        "CREATE INDEX ix_feedback_search ON feedback USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE feedback_fts USING fts5("
+        "strengths, areas_to_improve, content='feedback', content_rowid='id', tokenize='porter unicode61')",
+        "CREATE TRIGGER feedback_fts_ai AFTER INSERT ON feedback BEGIN "
+        "INSERT INTO feedback_fts(rowid, strengths, areas_to_improve) VALUES (new.id, new.strengths, new.areas_to_improve); END",
+        "CREATE TRIGGER feedback_fts_ad AFTER DELETE ON feedback BEGIN "
+        "INSERT INTO feedback_fts(feedback_fts, rowid, strengths, areas_to_improve) "
+        "VALUES ('delete', old.id, old.strengths, old.areas_to_improve); END",
+        "CREATE TRIGGER feedback_fts_au AFTER UPDATE OF strengths, areas_to_improve ON feedback BEGIN "
+        "INSERT INTO feedback_fts(feedback_fts, rowid, strengths, areas_to_improve) "
+        "VALUES ('delete', old.id, old.strengths, old.areas_to_improve); "
+        "INSERT INTO feedback_fts(rowid, strengths, areas_to_improve) VALUES (new.id, new.strengths, new.areas_to_improve); END",
+    ],
+}
+
+for _dialect, _statements in FEEDBACK_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Feedback.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app import models
+from app.middleware.auth import get_current_user, get_manager_user
+from app.services import hierarchy, rollups
+from app.services.read_routing import get_read_db
+from app.services.team_analytics import team_analytics
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+
+_TREND_DEFAULT_DAYS = {"day": 90, "week": 365}
+_TREND_MAX_PERIODS = 400
+
+# Per-member rating histogram, sentiment mix, pending acknowledgements and recency for the manager's team,
+# or with scope=subtree for everyone below them at any depth
+@router.get("/team")
+async def get_team_analytics(
+    scope: str = Query("team", pattern="^(team|subtree)$"),
+    manager_user: models.User = Depends(get_manager_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if scope == "team":
+        manager_ids = [manager_user.id]
+    else:
+        manager_ids = await hierarchy.subtree_manager_ids(db, manager_user.id)
+
+    # A subtree is the union of its managers' teams, so it reuses their cached entries
+    teams = await team_analytics.get_many(db, manager_ids)
+    members = [
+        {**member.to_dict(), "manager_id": team_manager_id}
+        for team_manager_id, stats in teams.items()
+        for member in stats.values()
+    ]
+    return {
+        "manager_id": manager_user.id,
+        "scope": scope,
+        "members": sorted(members, key=lambda m: m["user_id"]),
+    }
+
+# Rating and sentiment per day or ISO week for one person, or with scope=team summed over their direct reports.
+# Read from the rollups, so the cost follows the number of periods, not the number of feedback rows
+@router.get("/trends/{user_id}")
+async def get_rating_trends(
+    user_id: int,
+    grain: str = Query("week", pattern="^(day|week)$"),
+    scope: str = Query("user", pattern="^(user|team)$"),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    await _check_can_view(db, current_user, user_id)
+    if scope == "team" and not await db.get(models.User, user_id):
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    until = until or datetime.utcnow().date()
+    since = since or until - timedelta(days=_TREND_DEFAULT_DAYS[grain])
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must not be after until")
+    periods = (until - since).days // (7 if grain == "week" else 1) + 1
+    if periods > _TREND_MAX_PERIODS:
+        raise HTTPException(status_code=400, detail=f"At most {_TREND_MAX_PERIODS} {grain}s per request")
+
+    query = rollups.trend_query(grain, since, until, **({"manager_id": user_id} if scope == "team" else {"user_id": user_id}))
+    # Periods without feedback are left out
+    return {
+        "user_id": user_id,
+        "scope": scope,
+        "grain": grain,
+        "since": rollups.period_start(since, grain),
+        "until": until,
+        "points": [rollups.trend_point(row) for row in (await db.execute(query)).all()],
+    }
+
+# Stored rating and sentiment totals for one person, for summary cards that
+# would otherwise be computed from a single page of feedback
+@router.get("/summary/{user_id}")
+async def get_feedback_summary(
+    user_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    await _check_can_view(db, current_user, user_id)
+    user = await db.get(models.User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found.")
+    return {
+        "user_id": user.id,
+        "feedback_count": user.rating_count,
+        "average_rating": user.average_rating,
+        "positive_count": user.positive_count,
+        "neutral_count": user.neutral_count,
+        "negative_count": user.negative_count,
+    }
+
+
+async def _check_can_view(db: AsyncSession, current_user: models.User, user_id: int) -> None:
+    # Yourself, or (managers) anyone in your reporting line
+    if user_id != current_user.id:
+        if current_user.role != "manager" or not await hierarchy.is_in_subtree(db, current_user.id, user_id):
+            raise HTTPException(status_code=403, detail="You can only view analytics for yourself or people in your reporting line.")
@@ -1,32 +1,41 @@
 from app.services import auth
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models
 from app.database import get_db
 from app.middleware.auth import get_current_user
+from app.services.principal_cache import principal_cache
+from app.services.rate_limit import auth_limiter
+from app.services.team_analytics import team_analytics
 from app.schemas import user
 import os
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 
 @router.post("/register", response_model=user.UserOut)
-def register(user: user.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.username == user.username).first()
+async def register(user: user.UserCreate, request: Request, db: AsyncSession = Depends(get_db)):
+    await auth_limiter.check_register(request)
+    db_user = await db.scalar(select(models.User).where(models.User.username == user.username))
     if db_user:
         raise HTTPException(status_code=400, detail="Username already exists")
 
     if user.manager_id:
-        manager = db.query(models.User).filter(models.User.id == user.manager_id, models.User.role == "manager").first()
+        manager = await db.scalar(select(models.User).where(models.User.id == user.manager_id, models.User.role == "manager"))
         if not manager:
             raise HTTPException(status_code=400, detail="Manager not found")
 
-    created = auth.create_user(user, db)
+    created = await auth.create_user(user, db)
+    await principal_cache.invalidate(created.username)
+    team_analytics.invalidate(created.manager_id)
     return created
 
 
 @router.post("/login")
-def login(user: user.UserLogin, response: Response, db: Session = Depends(get_db)):
-    db_user = auth.authenticate_user(user.username, user.password, db)
+async def login(user: user.UserLogin, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    # Throttle before the user lookup and bcrypt verify, the expensive part
+    await auth_limiter.check_login(request, user.username)
+    db_user = await auth.authenticate_user(user.username, user.password, db)
     if not db_user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
@@ -47,12 +56,12 @@ def login(user: user.UserLogin, response: Response, db: Session = Depends(get_db
     return {"message": "Login successful"}
 
 @router.post("/logout")
-def logout(response: Response):
+async def logout(response: Response):
     response.delete_cookie("access_token", path="/")
     return {"message": "Logged out successfully"}
 
 @router.get("/me", response_model=user.UserOut)
-def get_current_user_profile(current_user: models.User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: models.User = Depends(get_current_user)):
     """
     Returns the currently logged-in user's profile.
     """
@@ -1,23 +1,38 @@
 # --- feedback/routes.py ---
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_user, get_manager_user, is_admin
 from app import models
-from app.schemas.feedback import FeedbackCreate, FeedbackUpdate, FeedbackAcknowledge, FeedbackOut, GiverInfo
+from app.services import hierarchy, ratings, rollups, versions
+from app.services.feedback_archive import window_reaches_archive
+from app.services.feedback_export import export_query, stream_export
+from app.services.notifications import notifications
+from app.services.read_routing import get_read_db, mark_written
+from app.services.team_analytics import team_analytics
+from app.services import feedback_search
+from app.services.feedback_queries import (
+    FeedbackListParams, FeedbackProjection, decode_cursor, feedback_filter_params, feedback_list_params,
+    feedback_list_queries, feedback_out_query, feedback_out_row, feedback_projection, feedback_row_serializer, paginate_feedback,
+)
+from app.schemas.feedback import FeedbackCreate, FeedbackUpdate, FeedbackAcknowledge, FeedbackAcknowledgeBulk, FeedbackAcknowledgeBulkResult, FeedbackOut, FeedbackListItem, FeedbackBulkResult, FeedbackSearchResult, GiverInfo
+from app import config
+from app.utils.etag import cache_headers, not_modified, weak_etag
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/api/feedback", tags=["Feedback"])
 
 # Create feedback (manager or developer can give feedback to anyone)
 @router.post("/create", response_model=FeedbackOut)
-def create_feedback(
+async def create_feedback(
     data: FeedbackCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    target_user = db.query(models.User).filter(models.User.id == data.target_user_id).first()
+    target_user = await db.get(models.User, data.target_user_id)
     if not target_user:
         raise HTTPException(status_code=404, detail="Target user not found")
 
@@ -30,40 +45,93 @@ def create_feedback(
         rating=data.rating
     )
     db.add(feedback)
-    db.commit()
-    db.refresh(feedback)
-    # Manually build FeedbackOut dict to include giver info
-    feedback_dict = {
-        "id": feedback.id,
-        "giver_id": feedback.giver_id,
-        "receiver_id": feedback.receiver_id,
-        "strengths": feedback.strengths,
-        "areas_to_improve": feedback.areas_to_improve,
-        "overall_sentiment": feedback.overall_sentiment,
-        "rating": feedback.rating,
-        "is_acknowledged": feedback.is_acknowledged,
-        "acknowledged_at": feedback.acknowledged_at.isoformat() if feedback.acknowledged_at else None,
-        "created_at": feedback.created_at.isoformat() if feedback.created_at else None,
-        "giver": {
-            "id": current_user.id,
-            "full_name": current_user.full_name
-        }
-    }
-    return feedback_dict
+    # Flushed first so the row's created_at picks its rollup buckets
+    await db.flush()
+    delta = ratings.feedback_delta(data.rating, data.overall_sentiment)
+    await ratings.apply_rating_deltas(db, {target_user.id: delta})
+    await rollups.apply_rollup_deltas(db, [(target_user.id, feedback.created_at, delta)])
+    await db.commit()
+    await db.refresh(feedback)
+    await mark_written(current_user.id, feedback.receiver_id)
+    team_analytics.record_created(feedback.receiver_id, feedback.rating, feedback.overall_sentiment, feedback.created_at)
+    out = _feedback_to_dict(feedback, current_user)
+    await notifications.publish(feedback.receiver_id, {"type": "feedback.created", "feedback": out})
+    return out
+
+# Submit many feedback items in one request (review cycles)
+@router.post("/bulk", response_model=FeedbackBulkResult)
+async def create_feedback_bulk(
+    items: List[FeedbackCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if not items:
+        raise HTTPException(status_code=400, detail="No feedback items submitted")
+    if len(items) > config.FEEDBACK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {config.FEEDBACK_BULK_MAX_ITEMS} items per request")
+
+    # Validate every target with one IN query
+    target_ids = {item.target_user_id for item in items}
+    existing = set((await db.scalars(select(models.User.id).where(models.User.id.in_(target_ids)))).all())
+
+    results = [None] * len(items)
+    accepted = []
+    for index, item in enumerate(items):
+        if item.target_user_id not in existing:
+            results[index] = {"index": index, "status": "failed", "error": "Target user not found"}
+        else:
+            accepted.append(index)
+
+    if accepted:
+        rows = [
+            {
+                "giver_id": current_user.id,
+                "receiver_id": items[index].target_user_id,
+                "strengths": items[index].strengths,
+                "areas_to_improve": items[index].areas_to_improve,
+                "overall_sentiment": items[index].overall_sentiment,
+                "rating": items[index].rating,
+            }
+            for index in accepted
+        ]
+        # One batched INSERT ... RETURNING, rows come back in submission order
+        created = (await db.scalars(
+            insert(models.Feedback).returning(models.Feedback, sort_by_parameter_order=True), rows
+        )).all()
+        deltas = [(fb.receiver_id, fb.created_at, ratings.feedback_delta(fb.rating, fb.overall_sentiment)) for fb in created]
+        await ratings.apply_rating_deltas(db, ratings.merge_deltas((user_id, delta) for user_id, _, delta in deltas))
+        await rollups.apply_rollup_deltas(db, deltas)
+        await db.commit()
+        await mark_written(current_user.id, *(fb.receiver_id for fb in created))
+        for fb in created:
+            team_analytics.record_created(fb.receiver_id, fb.rating, fb.overall_sentiment, fb.created_at)
+        for index, fb in zip(accepted, created):
+            out = _feedback_to_dict(fb, current_user)
+            results[index] = {"index": index, "status": "created", "feedback": out}
+            await notifications.publish(fb.receiver_id, {"type": "feedback.created", "feedback": out})
+
+    return {"created": len(accepted), "failed": len(items) - len(accepted), "results": results}
 
 # Update feedback
 @router.put("/update", response_model=FeedbackOut)
-def update_feedback(
+async def update_feedback(
     data: FeedbackUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    feedback = db.query(models.Feedback).filter(models.Feedback.id == data.feedback_id).first()
+    # Lock the row so concurrent edits can't both apply a delta from the same old values
+    feedback = await db.scalar(
+        select(models.Feedback)
+        .where(models.Feedback.id == data.feedback_id)
+        .with_for_update()
+    )
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     if feedback.giver_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only update feedback you gave")
 
+    old_rating, old_sentiment = feedback.rating, feedback.overall_sentiment
+
     if data.strengths is not None:
         feedback.strengths = data.strengths
     if data.areas_to_improve is not None:
@@ -73,101 +141,264 @@ def update_feedback(
     if data.rating is not None:
         feedback.rating = data.rating
 
-    db.commit()
-    db.refresh(feedback)
-    return feedback
+    delta = ratings.change_delta(old_rating, old_sentiment, feedback.rating, feedback.overall_sentiment)
+    if delta:
+        await ratings.apply_rating_deltas(db, {feedback.receiver_id: delta})
+        await rollups.apply_rollup_deltas(db, [(feedback.receiver_id, feedback.created_at, delta)])
+    else:
+        await versions.bump(db, [feedback.receiver_id])
+
+    await db.commit()
+    await db.refresh(feedback)
+    await mark_written(current_user.id, feedback.receiver_id)
+    if delta:
+        team_analytics.record_updated(feedback.receiver_id, old_rating, old_sentiment, feedback.rating, feedback.overall_sentiment)
+    out = _feedback_to_dict(feedback, current_user)
+    await notifications.publish(feedback.receiver_id, {"type": "feedback.updated", "feedback": out})
+    return out
 
 # Acknowledge feedback
 @router.post("/acknowledge")
-def acknowledge_feedback(
+async def acknowledge_feedback(
     data: FeedbackAcknowledge,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    feedback = db.query(models.Feedback).filter(models.Feedback.id == data.feedback_id).first()
-    if not feedback:
-        raise HTTPException(status_code=404, detail="Feedback not found")
-    if feedback.receiver_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only acknowledge feedback given to you")
-
-    if feedback.is_acknowledged:
+    fb = models.Feedback
+    acknowledged_at = datetime.utcnow()
+    # Conditional UPDATE ... RETURNING as in acknowledge-bulk: of two concurrent
+    # requests only one flips the row, so team analytics count it once
+    giver_id = (await db.execute(
+        update(fb)
+        .where(fb.id == data.feedback_id, fb.receiver_id == current_user.id, ~fb.is_acknowledged)
+        .values(is_acknowledged=True, acknowledged_at=acknowledged_at)
+        .returning(fb.giver_id)
+        .execution_options(synchronize_session=False)
+    )).scalar()
+    if giver_id is None:
+        feedback = await db.get(fb, data.feedback_id)
+        if not feedback:
+            raise HTTPException(status_code=404, detail="Feedback not found")
+        if feedback.receiver_id != current_user.id:
+            raise HTTPException(status_code=403, detail="You can only acknowledge feedback given to you")
         return {"message": "Already acknowledged"}
 
-    feedback.is_acknowledged = True
-    feedback.acknowledged_at = datetime.utcnow()
-    db.commit()
+    await versions.bump(db, [current_user.id])
+    await db.commit()
+    await mark_written(current_user.id, giver_id)
+    team_analytics.record_acknowledged(current_user.id)
+    await _publish_acknowledged({giver_id: [data.feedback_id]}, current_user.id, acknowledged_at)
     return {"message": "Feedback acknowledged"}
 
+# Acknowledge many received items at once, or everything received before a time
+@router.post("/acknowledge-bulk", response_model=FeedbackAcknowledgeBulkResult)
+async def acknowledge_feedback_bulk(
+    data: FeedbackAcknowledgeBulk,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if data.feedback_ids is not None and len(data.feedback_ids) > config.FEEDBACK_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {config.FEEDBACK_BULK_MAX_ITEMS} items per request")
+
+    fb = models.Feedback
+    acknowledged_at = datetime.utcnow()
+    # One UPDATE ... RETURNING over the receiver's unacknowledged partial index;
+    # ids that aren't theirs or are already acknowledged simply don't match
+    stmt = (
+        update(fb)
+        .where(fb.receiver_id == current_user.id, ~fb.is_acknowledged)
+        .values(is_acknowledged=True, acknowledged_at=acknowledged_at)
+        .returning(fb.id, fb.giver_id)
+        .execution_options(synchronize_session=False)
+    )
+    if data.feedback_ids is not None:
+        stmt = stmt.where(fb.id.in_(set(data.feedback_ids)))
+    else:
+        stmt = stmt.where(fb.created_at < data.before)
+
+    rows = (await db.execute(stmt)).all()
+    if rows:
+        await versions.bump(db, [current_user.id])
+    await db.commit()
+
+    by_giver = {}
+    for feedback_id, giver_id in rows:
+        by_giver.setdefault(giver_id, []).append(feedback_id)
+    if rows:
+        await mark_written(current_user.id, *by_giver)
+        team_analytics.record_acknowledged(current_user.id, len(rows))
+        await _publish_acknowledged(by_giver, current_user.id, acknowledged_at)
+    return {"acknowledged": len(rows), "feedback_ids": sorted(feedback_id for feedback_id, _ in rows)}
+
 # Get feedback received
-@router.get("/received", response_model=List[FeedbackOut])
-def get_received_feedback(
-    db: Session = Depends(get_db),
+@router.get("/received", response_model=List[FeedbackListItem])
+async def get_received_feedback(
+    request: Request,
+    params: FeedbackListParams = Depends(feedback_list_params),
+    projection: FeedbackProjection = Depends(feedback_projection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    feedbacks = db.query(models.Feedback).options(joinedload(models.Feedback.giver)).filter(models.Feedback.receiver_id == current_user.id).all()
-    result = []
-    for fb in feedbacks:
-        feedback_dict = {
-            "id": fb.id,
-            "giver_id": fb.giver_id,
-            "receiver_id": fb.receiver_id,
-            "strengths": fb.strengths,
-            "areas_to_improve": fb.areas_to_improve,
-            "overall_sentiment": fb.overall_sentiment,
-            "rating": fb.rating,
-            "is_acknowledged": fb.is_acknowledged,
-            "acknowledged_at": fb.acknowledged_at.isoformat() if fb.acknowledged_at else None,
-            "created_at": fb.created_at.isoformat() if fb.created_at else None,
-            "giver": {
-                "id": fb.giver.id if fb.giver else None,
-                "full_name": fb.giver.full_name if fb.giver else "Unknown"
-            }
-        }
-        result.append(feedback_dict)
-    return result
+    # The receiver's version moves on every create/update/acknowledge, so an
+    # unchanged version means an unchanged page
+    etag = weak_etag("received", current_user.id, await versions.user_version(db, current_user.id), sorted(request.query_params.multi_items()))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    query, archived = feedback_list_queries(projection, receiver_id=current_user.id)
+    rows, next_cursor = await paginate_feedback(db, query, params, archived)
+    return _feedback_page(rows, next_cursor, cache_headers(etag), feedback_row_serializer(projection))
 
 # Get feedback given
-@router.get("/given", response_model=List[FeedbackOut])
-def get_given_feedback(
-    db: Session = Depends(get_db),
+@router.get("/given", response_model=List[FeedbackListItem])
+async def get_given_feedback(
+    params: FeedbackListParams = Depends(feedback_list_params),
+    projection: FeedbackProjection = Depends(feedback_projection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    feedbacks = db.query(models.Feedback).filter(models.Feedback.giver_id == current_user.id).all()
-    return feedbacks
+    query, archived = feedback_list_queries(projection, giver_id=current_user.id)
+    rows, next_cursor = await paginate_feedback(db, query, params, archived)
+    return _feedback_page(rows, next_cursor, row_to_dict=feedback_row_serializer(projection))
 
-# Get feedback history for a specific user (manager only)
-@router.get("/history/{user_id}", response_model=List[FeedbackOut])
-def get_feedback_history_for_user(
+# Get feedback history for a specific user (manager only, anyone in their reporting subtree)
+@router.get("/history/{user_id}", response_model=List[FeedbackListItem])
+async def get_feedback_history_for_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    params: FeedbackListParams = Depends(feedback_list_params),
+    projection: FeedbackProjection = Depends(feedback_projection),
+    db: AsyncSession = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view feedback history for users.")
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
-    if user.manager_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only view feedback for your own team members.")
-    feedbacks = db.query(models.Feedback).options(joinedload(models.Feedback.giver)).filter(models.Feedback.receiver_id == user_id).all()
-    result = []
-    for fb in feedbacks:
-        # Build FeedbackOut dict manually to avoid from_orm issues with .giver
-        feedback_dict = {
-            "id": fb.id,
-            "giver_id": fb.giver_id,
-            "receiver_id": fb.receiver_id,
-            "strengths": fb.strengths,
-            "areas_to_improve": fb.areas_to_improve,
-            "overall_sentiment": fb.overall_sentiment,
-            "rating": fb.rating,
-            "is_acknowledged": fb.is_acknowledged,
-            "acknowledged_at": fb.acknowledged_at.isoformat() if fb.acknowledged_at else None,
-            "created_at": fb.created_at.isoformat() if fb.created_at else None,
-            "giver": {
-                "id": fb.giver.id if fb.giver else None,
-                "full_name": fb.giver.full_name if fb.giver else "Unknown"
-            }
+    if user.manager_id != current_user.id and not await hierarchy.is_in_subtree(db, current_user.id, user_id):
+        raise HTTPException(status_code=403, detail="You can only view feedback for people in your reporting line.")
+    query, archived = feedback_list_queries(projection, receiver_id=user_id)
+    rows, next_cursor = await paginate_feedback(db, query, params, archived)
+    return _feedback_page(rows, next_cursor, row_to_dict=feedback_row_serializer(projection))
+
+# Full-text search over strengths and areas to improve, scoped like the history endpoint
+@router.get("/search", response_model=List[FeedbackSearchResult])
+async def search_feedback(
+    q: str = Query(..., min_length=1, max_length=200, description='Words, "quoted phrases" and OR'),
+    user_id: Optional[int] = Query(None, description="Only feedback received by this person"),
+    sort: str = Query("relevance", pattern="^(relevance|recent)$"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    params: FeedbackListParams = Depends(feedback_filter_params),
+    db: AsyncSession = Depends(get_read_db),
+    manager_user: models.User = Depends(get_manager_user),
+):
+    query = feedback_search.search_query(db.bind.dialect.name, q)
+    if user_id is not None:
+        user = await db.get(models.User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found.")
+        if user.manager_id != manager_user.id and not await hierarchy.is_in_subtree(db, manager_user.id, user_id):
+            raise HTTPException(status_code=403, detail="You can only view feedback for people in your reporting line.")
+        query = query.where(models.Feedback.receiver_id == user_id)
+    else:
+        query = query.where(models.Feedback.receiver_id.in_(hierarchy.subtree_member_ids(manager_user.id)))
+
+    if sort == "recent":
+        params.cursor = decode_cursor(cursor) if cursor else None
+        rows, next_cursor = await paginate_feedback(db, query, params)
+    else:
+        rank_cursor = feedback_search.decode_rank_cursor(cursor) if cursor else None
+        rows, next_cursor = await feedback_search.paginate_by_rank(db, query, params, rank_cursor)
+    # Archived feedback isn't indexed for search; say so when it could have matched
+    headers = {"X-Archive-Excluded": "true"} if await window_reaches_archive(db, params.since) else None
+    return _feedback_page(rows, next_cursor, headers, row_to_dict=feedback_search.search_result_row)
+
+# Stream the feedback history of a manager's team, whole subtree, or (for admins) the org as CSV or NDJSON
+@router.get("/export")
+async def export_feedback_history(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    scope: str = Query("team", pattern="^(team|subtree|org)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: models.User = Depends(get_manager_user),
+):
+    if scope == "org" and not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Only admins can export the whole organisation.")
+
+    if scope == "org":
+        query = export_query(since=since, until=until)
+    elif scope == "subtree":
+        query = export_query(subtree_root=current_user.id, since=since, until=until)
+    else:
+        query = export_query(current_user.id, since, until)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_export(query, export_format, current_user.id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="feedback-{scope}.{export_format}"'},
+    )
+
+
+# One feedback item in full, for list views that fetched previews; visible to its
+# giver, its receiver and managers with the receiver in their reporting line
+@router.get("/{feedback_id:int}", response_model=FeedbackOut)
+async def get_feedback(
+    feedback_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    row = (await db.execute(feedback_out_query().where(models.Feedback.id == feedback_id))).first()
+    if not row:
+        # Archived items keep their ids
+        archived = models.FeedbackArchive
+        row = (await db.execute(feedback_out_query(source=archived).where(archived.id == feedback_id))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Feedback not found")
+    if current_user.id not in (row.giver_id, row.receiver_id) and not (
+        current_user.role == "manager" and await hierarchy.is_in_subtree(db, current_user.id, row.receiver_id)
+    ):
+        raise HTTPException(status_code=403, detail="You can only view feedback you gave, received, or that was given to someone in your reporting line.")
+    return ORJSONResponse(feedback_out_row(row))
+
+
+async def _publish_acknowledged(by_giver: dict, receiver_id: int, acknowledged_at: datetime) -> None:
+    # One event per giver, however many of their items were acknowledged
+    for giver_id, feedback_ids in by_giver.items():
+        await notifications.publish(giver_id, {
+            "type": "feedback.acknowledged",
+            "feedback_ids": sorted(feedback_ids),
+            "receiver_id": receiver_id,
+            "acknowledged_at": acknowledged_at.isoformat(),
+        })
+
+
+def _feedback_page(rows, next_cursor: str | None, headers: dict | None = None, row_to_dict=feedback_out_row) -> ORJSONResponse:
+    # Rows are already in the route's documented shape (FeedbackOut or
+    # FeedbackListItem), so skip response_model re-validation and let orjson
+    # encode datetimes and enums directly. The body stays a plain list for
+    # existing clients; the cursor travels in a header.
+    headers = dict(headers or {})
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return ORJSONResponse([row_to_dict(row) for row in rows], headers=headers)
+
+
+# Build FeedbackOut dict manually to avoid from_orm issues with .giver
+def _feedback_to_dict(fb: models.Feedback, giver: models.User | None) -> dict:
+    return {
+        "id": fb.id,
+        "giver_id": fb.giver_id,
+        "receiver_id": fb.receiver_id,
+        "strengths": fb.strengths,
+        "areas_to_improve": fb.areas_to_improve,
+        "overall_sentiment": fb.overall_sentiment,
+        "rating": fb.rating,
+        "is_acknowledged": fb.is_acknowledged,
+        "acknowledged_at": fb.acknowledged_at.isoformat() if fb.acknowledged_at else None,
+        "created_at": fb.created_at.isoformat() if fb.created_at else None,
+        "giver": {
+            "id": giver.id if giver else None,
+            "full_name": giver.full_name if giver else "Unknown"
         }
-        result.append(feedback_dict)
-    return result
+    }
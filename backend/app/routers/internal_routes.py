@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.database import replicas
+from app.middleware.auth import require_internal_token
+from app.services.notifications import notifications
+from app.services.principal_cache import principal_cache
+from app.utils import metrics, pool_stats, security
+
+router = APIRouter(prefix="/api/internal", tags=["Internal"], dependencies=[Depends(require_internal_token)])
+# Served at the conventional scrape path rather than under /api/internal
+metrics_router = APIRouter(tags=["Internal"], dependencies=[Depends(require_internal_token)])
+
+# Connection pool occupancy, replica routing, cache, notification stream, sign-in throttling counters and boot timings for this worker process
+@router.get("/stats")
+async def get_internal_stats():
+    return {
+        "pools": pool_stats.snapshot(),
+        "read_routing": replicas.stats(),
+        "principal_cache": principal_cache.stats(),
+        "notifications": notifications.stats(),
+        "auth": {"rejected": dict(metrics.registry.auth_rejections), "hash_pool": security.hash_pool_stats()},
+        "cold_start": metrics.registry.cold_start.as_dict(),
+    }
+
+
+# Prometheus text exposition of this worker's request, SQL and pool metrics
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from app import config, models
+from app.middleware.auth import get_streaming_user
+from app.services.notifications import Subscription, notifications
+
+router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+_RETRY_MS = 3000
+
+
+class _EventStreamResponse(StreamingResponse):
+    """Releases the stream's slot however the response ends, even if the client left before the body started."""
+
+    def __init__(self, subscription: Subscription):
+        super().__init__(
+            _event_stream(subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            notifications.release(self.subscription)
+
+
+# Server-sent events for the logged-in user: feedback received or updated, and acknowledgements of feedback they gave
+@router.get("/stream")
+async def stream_notifications(current_user: models.User = Depends(get_streaming_user)):
+    # Admitted and counted before returning, with no await in between
+    return _EventStreamResponse(notifications.admit(current_user.id))
+
+
+async def _event_stream(subscription: Subscription):
+    deadline = time.monotonic() + config.NOTIFY_MAX_STREAM_SECONDS
+    yield f"retry: {_RETRY_MS}\n\n"
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            event = await asyncio.wait_for(subscription.next_event(), min(remaining, config.NOTIFY_HEARTBEAT_SECONDS))
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -1,40 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from app.database import get_db
 from app import models
 from app.middleware.auth import get_current_user, get_manager_user
+from app.utils.etag import cache_headers, not_modified, weak_etag
+from app.utils.fields import requested_fields
+from app.services import hierarchy, versions
+from app.services.principal_cache import principal_cache
+from app.services.read_routing import get_public_read_db, get_read_db, mark_written
+from app.services.team_analytics import team_analytics
 
 router = APIRouter(prefix="/api/users", tags=["User Management"])
 
+# Fields each user list can be narrowed to with ?fields= (id is always included)
+TEAM_FIELDS = ("id", "username", "full_name", "role", "rating")
+ORG_FIELDS = ("id", "username", "full_name", "role", "manager_id", "depth", "rating")
+ALL_FIELDS = ("id", "username", "full_name", "role", "rating", "manager")
+_MANAGER_FIELDS = ("id", "username", "full_name", "rating")
+_FIELDS_HELP = "Comma-separated subset of the listed fields"
+
 # Assign self as manager to a developer (only if you're a manager)
 @router.put("/{user_id}/assign-manager")
-def assign_self_as_manager(
+async def assign_self_as_manager(
     user_id: int = Path(..., description="ID of the developer"),
     manager_user: models.User = Depends(get_manager_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    dev = db.query(models.User).filter(models.User.id == user_id).first()
+    dev = await db.get(models.User, user_id)
     if not dev:
         raise HTTPException(status_code=404, detail="User not found.")
     if dev.role != "developer":
         raise HTTPException(status_code=400, detail="Target user must be a developer.")
+    if await hierarchy.would_create_cycle(db, dev.id, manager_user.id):
+        raise HTTPException(status_code=400, detail="This assignment would create a reporting cycle.")
 
+    previous_manager_id = dev.manager_id
     dev.manager_id = manager_user.id
-    db.commit()
-    db.refresh(dev)
+    await versions.bump(db, [dev.id])
+    await db.commit()
+    await principal_cache.invalidate(dev.username)
+    await mark_written(dev.id, manager_user.id, previous_manager_id)
+    team_analytics.invalidate(previous_manager_id)
+    team_analytics.invalidate(manager_user.id)
     return {"message": f"{dev.username} is now managed by {manager_user.username}"}
 
 
 # Reassign developer to a different manager (can be any manager)
 @router.put("/{user_id}/change-manager/{new_manager_id}")
-def change_manager(
+async def change_manager(
     user_id: int,
     new_manager_id: int,
     manager_user: models.User = Depends(get_manager_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    dev = db.query(models.User).filter(models.User.id == user_id).first()
-    new_manager = db.query(models.User).filter(models.User.id == new_manager_id).first()
+    dev = await db.get(models.User, user_id)
+    new_manager = await db.get(models.User, new_manager_id)
 
     if not dev:
         raise HTTPException(status_code=404, detail="User not found.")
@@ -42,42 +66,68 @@ def change_manager(
         raise HTTPException(status_code=400, detail="Target user must be a developer.")
     if not new_manager or new_manager.role != "manager":
         raise HTTPException(status_code=400, detail="New manager must have role 'manager'.")
+    if await hierarchy.would_create_cycle(db, dev.id, new_manager.id):
+        raise HTTPException(status_code=400, detail="This assignment would create a reporting cycle.")
 
+    previous_manager_id = dev.manager_id
     dev.manager_id = new_manager.id
-    db.commit()
-    db.refresh(dev)
+    await versions.bump(db, [dev.id])
+    await db.commit()
+    await principal_cache.invalidate(dev.username)
+    await mark_written(dev.id, manager_user.id, previous_manager_id, new_manager.id)
+    team_analytics.invalidate(previous_manager_id)
+    team_analytics.invalidate(new_manager.id)
     return {"message": f"{dev.username} is now managed by {new_manager.username}"}
 
 
 # Get team members for the currently logged-in manager
 @router.get("/team")
-def get_my_team(
+async def get_my_team(
+    request: Request,
+    fields: Optional[str] = Query(None, description=f"{_FIELDS_HELP}: {', '.join(TEAM_FIELDS)}"),
     manager_user: models.User = Depends(get_manager_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    team = db.query(models.User).filter(models.User.manager_id == manager_user.id).all()
-    return [
-        {
-            "id": dev.id,
-            "username": dev.username,
-            "full_name": dev.full_name,
-            "role": dev.role,
-            "rating": dev.average_rating or 5
-        }
-        for dev in team
-    ]
+    selected = requested_fields(fields, TEAM_FIELDS)
+    etag = weak_etag("team", manager_user.id, selected, await versions.users_fingerprint(db, manager_user.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    rows = (await db.execute(
+        select(*_user_columns(models.User, selected)).where(models.User.manager_id == manager_user.id)
+    )).all()
+    return ORJSONResponse([_user_row(row, selected) for row in rows], headers=cache_headers(etag))
+
+
+# Everyone below the logged-in manager at any depth, nearest levels first
+@router.get("/org")
+async def get_my_org(
+    max_depth: int | None = Query(None, ge=1),
+    fields: Optional[str] = Query(None, description=f"{_FIELDS_HELP}: {', '.join(ORG_FIELDS)}"),
+    manager_user: models.User = Depends(get_manager_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    selected = requested_fields(fields, ORG_FIELDS)
+    tree = hierarchy.subtree_cte(manager_user.id, max_depth)
+    rows = (await db.execute(
+        select(*_user_columns(models.User, selected), tree.c.depth)
+        .join(tree, models.User.id == tree.c.id)
+        .order_by(tree.c.depth, models.User.id)
+    )).all()
+    return ORJSONResponse([_user_row(row, selected) for row in rows])
 
 
 # Get my current manager (as a developer)
 @router.get("/manager")
-def get_my_manager(
+async def get_my_manager(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     if current_user.manager_id is None:
         return {"manager": None}
 
-    manager = db.query(models.User).filter(models.User.id == current_user.manager_id).first()
+    manager = await db.get(models.User, current_user.manager_id)
     if not manager:
         return {"manager": None}
 
@@ -93,42 +143,35 @@ def get_my_manager(
 
 # Get all users with their manager info (manager-only access)
 @router.get("/all")
-def get_all_users(
+async def get_all_users(
+    request: Request,
+    fields: Optional[str] = Query(None, description=f"{_FIELDS_HELP}: {', '.join(ALL_FIELDS)}"),
     manager_user: models.User = Depends(get_manager_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    users = db.query(models.User).all()
-    result = []
-
-    for user in users:
-        manager = (
-            db.query(models.User)
-            .filter(models.User.id == user.manager_id)
-            .first()
-            if user.manager_id
-            else None
+    selected = requested_fields(fields, ALL_FIELDS)
+    etag = weak_etag("all", selected, await versions.users_fingerprint(db))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # One self-join instead of a manager lookup per user (skipped when the
+    # manager isn't requested); ratings come from the stored aggregate
+    # columns, so no feedback rows are touched
+    query = select(*_user_columns(models.User, selected)).order_by(models.User.id)
+    if "manager" in selected:
+        manager_alias = aliased(models.User)
+        query = query.add_columns(*_user_columns(manager_alias, _MANAGER_FIELDS, "manager_")).outerjoin(
+            manager_alias, models.User.manager_id == manager_alias.id
         )
-        result.append({
-            "id": user.id,
-            "username": user.username,
-            "full_name": user.full_name,
-            "role": user.role,
-            "rating": user.average_rating or 5,
-            "manager": {
-                "id": manager.id,
-                "username": manager.username,
-                "full_name": manager.full_name,
-                "rating": manager.average_rating or 5
-            } if manager else None
-        })
-
-    return result
+    rows = (await db.execute(query)).all()
+    return ORJSONResponse([_user_row(row, selected) for row in rows], headers=cache_headers(etag))
 
 
 # List all managers
 @router.get("/managers")
-def get_all_managers(db: Session = Depends(get_db)):
-    managers = db.query(models.User).filter(models.User.role == "manager").all()
+async def get_all_managers(db: AsyncSession = Depends(get_public_read_db)):
+    managers = (await db.scalars(select(models.User).where(models.User.role == "manager"))).all()
     return [
         {
             "id": m.id,
@@ -141,16 +184,44 @@ def get_all_managers(db: Session = Depends(get_db)):
 
 # Fetch a single user by ID
 @router.get("/{user_id}")
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
+async def get_user(user_id: int, db: AsyncSession = Depends(get_public_read_db)):
+    manager_alias = aliased(models.User)
+    row = (await db.execute(
+        select(models.User, manager_alias)
+        .outerjoin(manager_alias, models.User.manager_id == manager_alias.id)
+        .where(models.User.id == user_id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="User not found.")
-    manager = (
-        db.query(models.User)
-        .filter(models.User.id == user.manager_id)
-        .first()
-        if user.manager_id else None
-    )
+    return _user_with_manager(*row)
+
+
+def _user_columns(entity, fields: Tuple[str, ...], prefix: str = "") -> list:
+    """Only the columns behind `fields`, labelled `prefix + name`; nested and computed fields are skipped."""
+    columns = []
+    for name in fields:
+        if name == "rating":
+            columns += [entity.rating_sum.label(f"{prefix}rating_sum"), entity.rating_count.label(f"{prefix}rating_count")]
+        elif name not in ("manager", "depth"):
+            columns.append(getattr(entity, name).label(prefix + name))
+    return columns
+
+
+def _user_row(row, fields: Tuple[str, ...], prefix: str = "") -> dict:
+    values = row._mapping
+    out = {}
+    for name in fields:
+        if name == "rating":
+            count = values[f"{prefix}rating_count"]
+            out["rating"] = round(values[f"{prefix}rating_sum"] / count, 2) if count else 5
+        elif name == "manager":
+            out["manager"] = _user_row(row, _MANAGER_FIELDS, "manager_") if values["manager_id"] is not None else None
+        else:
+            out[name] = values[prefix + name]
+    return out
+
+
+def _user_with_manager(user: models.User, manager: models.User | None) -> dict:
     return {
         "id": user.id,
         "username": user.username,
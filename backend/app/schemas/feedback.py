@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator, validator
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class FeedbackSentiment(str, Enum):
@@ -25,6 +25,21 @@ class FeedbackUpdate(BaseModel):
 class FeedbackAcknowledge(BaseModel):
     feedback_id: int
 
+class FeedbackAcknowledgeBulk(BaseModel):
+    # Exactly one of: specific items, or everything received before a time
+    feedback_ids: Optional[List[int]] = None
+    before: Optional[datetime] = None
+
+    @root_validator(skip_on_failure=True)
+    def one_selector(cls, values):
+        if (values.get("feedback_ids") is None) == (values.get("before") is None):
+            raise ValueError("Provide either feedback_ids or before")
+        return values
+
+class FeedbackAcknowledgeBulkResult(BaseModel):
+    acknowledged: int
+    feedback_ids: List[int]
+
 class GiverInfo(BaseModel):
     id: int | None = None
     full_name: str | None = None
@@ -51,3 +66,35 @@ class FeedbackOut(BaseModel):
             return v.isoformat()
         return v
 
+class FeedbackListItem(BaseModel):
+    # One row of /received, /given or /history. Without ?fields= or ?preview_chars=
+    # it has every FeedbackOut field; ?fields= keeps only those named (plus id),
+    # and ?preview_chars= cuts the text fields and adds `truncated`
+    id: int
+    giver_id: Optional[int] = None
+    receiver_id: Optional[int] = None
+    strengths: Optional[str] = None
+    areas_to_improve: Optional[str] = None
+    overall_sentiment: Optional[FeedbackSentiment] = None
+    rating: Optional[int] = None
+    is_acknowledged: Optional[bool] = None
+    acknowledged_at: Optional[str] = None
+    created_at: Optional[str] = None
+    giver: Optional[GiverInfo] = None
+    truncated: Optional[bool] = None  # only with ?preview_chars=; fetch GET /api/feedback/{id} for the full text
+
+class FeedbackSearchResult(FeedbackOut):
+    rank: float  # higher is more relevant; only comparable within one search
+    strengths_highlight: str  # HTML-escaped snippet with matches wrapped in <mark>
+    areas_to_improve_highlight: str
+
+class FeedbackBulkItemResult(BaseModel):
+    index: int  # position in the submitted list
+    status: str  # "created" or "failed"
+    feedback: Optional[FeedbackOut] = None
+    error: Optional[str] = None
+
+class FeedbackBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[FeedbackBulkItemResult]
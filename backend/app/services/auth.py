@@ -1,24 +1,17 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt
 from datetime import datetime, timedelta
 
 from app import models, config
-from app.database import SessionLocal
-from app.utils.security import hash_password,verify_password
+from app.utils.security import hash_password_async, verify_and_update_async
 from fastapi import HTTPException, status
 
 from app.schemas import user
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def create_user(user: user.UserCreate, db: Session):
+async def create_user(user: user.UserCreate, db: AsyncSession):
     if user.manager_id is not None:
-        manager = db.query(models.User).filter(models.User.id == user.manager_id).first()
+        manager = await db.get(models.User, user.manager_id)
         if not manager:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -30,7 +23,7 @@ def create_user(user: user.UserCreate, db: Session):
                 detail="Assigned manager_id does not belong to a user with role 'manager'"
             )
 
-    hashed = hash_password(user.password)
+    hashed = await hash_password_async(user.password)
     new_user = models.User(
         username=user.username,
         hashed_password=hashed,
@@ -39,14 +32,21 @@ def create_user(user: user.UserCreate, db: Session):
         manager_id=user.manager_id
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
-def authenticate_user(username: str, password: str, db: Session):
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(username: str, password: str, db: AsyncSession):
+    user = await db.scalar(select(models.User).where(models.User.username == username))
+    if not user:
+        return None
+    verified, new_hash = await verify_and_update_async(password, user.hashed_password)
+    if not verified:
         return None
+    # Stored hash was made with a different cost factor; upgrade it in place
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 def create_jwt_token(user: models.User):
@@ -0,0 +1,102 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config, models
+
+_feedback = models.Feedback.__table__
+_archive = models.FeedbackArchive.__table__
+_ARCHIVED_COLUMNS = [column.name for column in _archive.columns if column.name != "archived_at"]
+
+# The archive job and the app servers may disagree on the time; reading the
+# archive a day early never misses a row
+_HORIZON_SLACK = timedelta(days=1)
+
+
+def as_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+def archive_cutoff() -> Optional[datetime]:
+    """Acknowledged feedback created before this is due for archiving; None when archiving is off."""
+    if config.FEEDBACK_ARCHIVE_AFTER_DAYS <= 0:
+        return None
+    return datetime.now(timezone.utc) - timedelta(days=config.FEEDBACK_ARCHIVE_AFTER_DAYS)
+
+
+class ArchiveExtent:
+    """
+    Per-worker note of the newest created_at in feedback_archive, re-read at
+    most every `ttl` seconds. It keeps rows archived under an earlier, or
+    since disabled, FEEDBACK_ARCHIVE_AFTER_DAYS readable. Rows the archive
+    job moves in the meantime are older than the configured horizon, so a
+    stale value never hides them.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.reset()
+
+    def reset(self) -> None:
+        self._newest: Optional[datetime] = None
+        self._checked_at = float("-inf")
+
+    async def newest(self, db: AsyncSession) -> Optional[datetime]:
+        if time.monotonic() - self._checked_at >= self.ttl:
+            newest = await db.scalar(select(func.max(_archive.c.created_at)))
+            self._newest = as_utc(newest) if newest else None
+            self._checked_at = time.monotonic()
+        return self._newest
+
+
+archive_extent = ArchiveExtent(ttl=60)
+
+
+async def archive_horizon(db: AsyncSession) -> Optional[datetime]:
+    """
+    Nothing created at or after this time is in the archive; None when the
+    archive is empty and archiving is off.
+    """
+    horizons = []
+    cutoff = archive_cutoff()
+    if cutoff:
+        horizons.append(cutoff + _HORIZON_SLACK)
+    newest = await archive_extent.newest(db)
+    if newest:
+        # Past the newest row even at SQLite's whole-second precision
+        horizons.append(newest + timedelta(seconds=1))
+    return max(horizons, default=None)
+
+
+async def window_reaches_archive(db: AsyncSession, since: Optional[datetime]) -> bool:
+    """Whether feedback created from `since` (or ever, when None) may include archived rows."""
+    horizon = await archive_horizon(db)
+    return horizon is not None and (since is None or as_utc(since) < horizon)
+
+
+def archive_batch(conn: Connection, cutoff: datetime, batch_size: int) -> int:
+    """
+    Move up to `batch_size` acknowledged rows created before `cutoff` into
+    feedback_archive, in the caller's transaction. Ids are kept, and the
+    stored aggregates and rollups already count these rows, so nothing else
+    changes. Returns the number of rows moved.
+    """
+    ids = select(_feedback.c.id).where(_feedback.c.is_acknowledged, _feedback.c.created_at < cutoff).limit(batch_size)
+    if conn.dialect.name == "postgresql":
+        # Rows being edited or acknowledged right now wait for the next run
+        ids = ids.with_for_update(skip_locked=True)
+    ids = conn.execute(ids).scalars().all()
+    if not ids:
+        return 0
+    # created_at in both predicates lets Postgres prune to the old partitions
+    moving = (_feedback.c.id.in_(ids), _feedback.c.created_at < cutoff)
+    conn.execute(insert(_archive).from_select(
+        _ARCHIVED_COLUMNS, select(*(_feedback.c[name] for name in _ARCHIVED_COLUMNS)).where(*moving)
+    ))
+    conn.execute(_feedback.delete().where(*moving))
+    return len(ids)
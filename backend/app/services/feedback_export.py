@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import Select, select, union_all
+from sqlalchemy.orm import aliased
+
+from app import config, models
+from app.services.hierarchy import subtree_member_ids
+from app.services.read_routing import read_session
+
+EXPORT_COLUMNS = (
+    "id", "receiver_id", "receiver_name", "giver_id", "giver_name",
+    "overall_sentiment", "rating", "strengths", "areas_to_improve",
+    "is_acknowledged", "acknowledged_at", "created_at",
+)
+
+# Rows buffered into one chunk of the response body
+_ROWS_PER_CHUNK = 200
+
+
+def export_query(manager_id: Optional[int] = None, since=None, until=None, subtree_root: Optional[int] = None):
+    """
+    Flat feedback rows for a manager's direct reports, everyone below
+    subtree_root, or the whole org when neither is given. Archived feedback
+    is always included; with a recent `since` that side is an index range
+    that finds nothing.
+    """
+    # One subtree CTE shared by both sides; two separate ones would clash by name
+    members = subtree_member_ids(subtree_root) if subtree_root is not None else None
+    query = union_all(*(
+        _export_select(fb, manager_id, since, until, members) for fb in (models.Feedback, models.FeedbackArchive)
+    ))
+    columns = query.selected_columns
+    return query.order_by(columns.receiver_id, columns.created_at, columns.id)
+
+
+def _export_select(fb, manager_id, since, until, members) -> Select:
+    receiver = aliased(models.User)
+    giver = aliased(models.User)
+    query = (
+        # Labelled so the archive's rows line up under one ORDER BY when unioned
+        select(*(column.label(name) for name, column in zip(EXPORT_COLUMNS, (
+            fb.id, fb.receiver_id, receiver.full_name, fb.giver_id, giver.full_name,
+            fb.overall_sentiment, fb.rating, fb.strengths, fb.areas_to_improve,
+            fb.is_acknowledged, fb.acknowledged_at, fb.created_at,
+        ))))
+        .join(receiver, fb.receiver_id == receiver.id)
+        .outerjoin(giver, fb.giver_id == giver.id)
+    )
+    if manager_id is not None:
+        query = query.where(receiver.manager_id == manager_id)
+    if members is not None:
+        query = query.where(fb.receiver_id.in_(members))
+    if since is not None:
+        query = query.where(fb.created_at >= since)
+    if until is not None:
+        query = query.where(fb.created_at < until)
+    return query
+
+
+def _plain(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, models.FeedbackSentiment):
+        return value.value
+    return value
+
+
+async def stream_export(query: Select, fmt: str, user_id: int) -> AsyncIterator[str]:
+    """
+    Encode rows as they arrive from a server-side cursor. The generator owns
+    its session because it outlives the request handler, and only ever holds
+    one fetch batch plus one output chunk in memory. Exports read from a
+    replica when one is configured, unless `user_id` (the exporting user)
+    has a recent write.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+
+    async with read_session(user_id) as db:
+        result = await db.stream(query.execution_options(yield_per=config.FEEDBACK_EXPORT_BATCH_SIZE))
+        pending = 0
+        async for row in result:
+            values = [_plain(value) for value in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                buffer.write("\n")
+            pending += 1
+            if pending >= _ROWS_PER_CHUNK:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
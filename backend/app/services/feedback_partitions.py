@@ -0,0 +1,155 @@
+"""
+Postgres only: feedback as a table range-partitioned on created_at, one
+partition per month plus feedback_default. Converting is a separate, explicit
+step (scripts/partition_feedback.py), never part of `alembic upgrade`; the
+archive job keeps the coming months' partitions ready.
+"""
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Everything but the generated search_vector column; the partition key can't be NULL
+_COLUMNS = (
+    "id, giver_id, receiver_id, strengths, areas_to_improve, overall_sentiment, rating, "
+    "is_acknowledged, acknowledged_at, created_at, updated_at"
+)
+_SOURCE_COLUMNS = _COLUMNS.replace("created_at, updated_at", "COALESCE(created_at, now()), updated_at")
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql" and conn.exec_driver_sql(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'feedback'::regclass"
+    ).first() is not None
+
+
+def next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _create_partition(conn: Connection, month: date) -> str:
+    name = f"feedback_{month:%Y_%m}"
+    conn.exec_driver_sql(
+        f"CREATE TABLE {name} PARTITION OF feedback "
+        f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{next_month(month)} 00:00:00+00')"
+    )
+    return name
+
+
+def _split_out_of_default(conn: Connection, month: date) -> int:
+    """
+    Create a month's partition when feedback_default already holds rows for
+    it, which Postgres refuses to do directly: the rows are parked in a temp
+    table, the partition is created, and they are inserted back through
+    feedback so they land in it. Ids are kept; search_vector is regenerated.
+    Returns the rows moved.
+    """
+    in_month = f"created_at >= '{month} 00:00:00+00' AND created_at < '{next_month(month)} 00:00:00+00'"
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE feedback_moving AS SELECT {_COLUMNS} FROM feedback_default WHERE {in_month}"
+    )
+    moved = conn.exec_driver_sql(f"DELETE FROM feedback_default WHERE {in_month}").rowcount
+    _create_partition(conn, month)
+    conn.exec_driver_sql(f"INSERT INTO feedback ({_COLUMNS}) SELECT {_COLUMNS} FROM feedback_moving")
+    conn.exec_driver_sql("DROP TABLE feedback_moving")
+    return moved
+
+
+def ensure_partitions(conn: Connection, months_ahead: int) -> List[str]:
+    """
+    Create the monthly feedback partitions from this month through
+    `months_ahead` months out, inside the caller's transaction. A month whose
+    rows already landed in feedback_default (nobody ran this in time) is
+    split out of it. Each month runs in its own savepoint: one that fails is
+    logged and skipped, and the rest, and the caller's work, go ahead.
+    Returns the partitions created.
+    """
+    if not is_partitioned(conn):
+        return []
+    existing = set(conn.exec_driver_sql(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'feedback'::regclass"
+    ).scalars())
+    created = []
+    month = datetime.now(timezone.utc).date().replace(day=1)
+    for _ in range(months_ahead + 1):
+        name = f"feedback_{month:%Y_%m}"
+        if name not in existing:
+            try:
+                with conn.begin_nested():
+                    stranded = conn.exec_driver_sql(
+                        "SELECT 1 FROM feedback_default "
+                        f"WHERE created_at >= '{month} 00:00:00+00' AND created_at < '{next_month(month)} 00:00:00+00' LIMIT 1"
+                    ).first()
+                    if stranded:
+                        moved = _split_out_of_default(conn, month)
+                        logger.warning("Moved %d rows from feedback_default into new partition %s", moved, name)
+                    else:
+                        _create_partition(conn, month)
+                created.append(name)
+            except DBAPIError:
+                logger.exception("Could not create feedback partition %s; skipping it", name)
+        month = next_month(month)
+    return created
+
+
+def _replace_feedback(conn: Connection, old_name: str, partition_by: str) -> None:
+    # The new table takes over the sequence, defaults and generated column;
+    # keys and indexes are added after the copy, which is faster
+    conn.exec_driver_sql(f"ALTER TABLE feedback RENAME TO {old_name}")
+    conn.exec_driver_sql("ALTER SEQUENCE feedback_id_seq OWNED BY NONE")
+    conn.exec_driver_sql(f"CREATE TABLE feedback (LIKE {old_name} INCLUDING DEFAULTS INCLUDING GENERATED) {partition_by}")
+
+
+def _copy_and_index(conn: Connection, old_name: str, primary_key: str) -> None:
+    for statement in (
+        f"INSERT INTO feedback ({_COLUMNS}) SELECT {_SOURCE_COLUMNS} FROM {old_name}",
+        f"DROP TABLE {old_name}",
+        "ALTER SEQUENCE feedback_id_seq OWNED BY feedback.id",
+        f"ALTER TABLE feedback ADD CONSTRAINT feedback_pkey PRIMARY KEY ({primary_key})",
+        "ALTER TABLE feedback ADD CONSTRAINT feedback_giver_id_fkey FOREIGN KEY (giver_id) REFERENCES users (id)",
+        "ALTER TABLE feedback ADD CONSTRAINT feedback_receiver_id_fkey FOREIGN KEY (receiver_id) REFERENCES users (id)",
+        "CREATE INDEX ix_feedback_id ON feedback (id)",
+        "CREATE INDEX ix_feedback_receiver_created ON feedback (receiver_id, created_at, id)",
+        "CREATE INDEX ix_feedback_giver_created ON feedback (giver_id, created_at, id)",
+        "CREATE INDEX ix_feedback_receiver_unacknowledged ON feedback (receiver_id, created_at, id) WHERE NOT is_acknowledged",
+        "CREATE INDEX ix_feedback_search ON feedback USING gin (search_vector)",
+        "ANALYZE feedback",
+    ):
+        conn.exec_driver_sql(statement)
+
+
+def partition(conn: Connection, months_ahead: int) -> List[str]:
+    """
+    Rebuild feedback as monthly partitions, from the month of the oldest row
+    through `months_ahead` months out, inside the caller's transaction. The
+    primary key becomes (id, created_at), as Postgres requires the partition
+    key in it; ids keep coming from the same sequence. Returns the
+    partitions created.
+    """
+    _replace_feedback(conn, "feedback_unpartitioned", "PARTITION BY RANGE (created_at)")
+
+    first = conn.exec_driver_sql("SELECT min(created_at) FROM feedback_unpartitioned").scalar()
+    now = datetime.now(timezone.utc)
+    month = (first or now).astimezone(timezone.utc).date().replace(day=1)
+    last = now.date().replace(day=1)
+    for _ in range(months_ahead):
+        last = next_month(last)
+    created = []
+    while month <= last:
+        created.append(_create_partition(conn, month))
+        month = next_month(month)
+    conn.exec_driver_sql("CREATE TABLE feedback_default PARTITION OF feedback DEFAULT")
+
+    _copy_and_index(conn, "feedback_unpartitioned", "id, created_at")
+    return created + ["feedback_default"]
+
+
+def unpartition(conn: Connection) -> None:
+    """Turn partitioned feedback back into one plain table, inside the caller's transaction."""
+    _replace_feedback(conn, "feedback_partitioned", "")
+    _copy_and_index(conn, "feedback_partitioned", "id")
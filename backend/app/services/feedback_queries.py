@@ -0,0 +1,238 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import Row, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app import config, models
+from app.schemas.feedback import FeedbackSentiment
+from app.services.feedback_archive import archive_horizon, as_utc
+from app.utils.fields import requested_fields
+
+
+_giver = aliased(models.User, name="giver")
+
+
+# Fields a list route can be narrowed to with ?fields=; "giver" is the giver's id and name
+FEEDBACK_FIELDS = (
+    "id", "giver_id", "receiver_id", "strengths", "areas_to_improve", "overall_sentiment",
+    "rating", "is_acknowledged", "acknowledged_at", "created_at", "giver",
+)
+_TEXT_FIELDS = ("strengths", "areas_to_improve")
+_ELLIPSIS = "\u2026"
+
+
+@dataclass
+class FeedbackProjection:
+    fields: Tuple[str, ...] = FEEDBACK_FIELDS
+    preview_chars: Optional[int] = None
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields == FEEDBACK_FIELDS and self.preview_chars is None
+
+
+# FastAPI dependency for sparse fieldsets and text previews on feedback lists
+def feedback_projection(
+    fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(FEEDBACK_FIELDS)} (id is always included)"),
+    preview_chars: Optional[int] = Query(None, ge=1, le=10_000, description="Truncate strengths and areas_to_improve to this many characters"),
+) -> FeedbackProjection:
+    return FeedbackProjection(requested_fields(fields, FEEDBACK_FIELDS), preview_chars)
+
+
+def feedback_out_query(projection: Optional[FeedbackProjection] = None, source=models.Feedback) -> Select:
+    """
+    Exactly the columns FeedbackOut needs, with the giver's name joined in,
+    so list routes never hydrate ORM objects or load whole user rows. With a
+    projection, only the requested columns are selected (plus created_at and
+    id for the cursor) and previewed text is cut short in SQL. `source` is
+    Feedback or FeedbackArchive.
+    """
+    fb = source
+    if projection is None or projection.is_full:
+        return select(
+            fb.id, fb.giver_id, fb.receiver_id, fb.strengths, fb.areas_to_improve,
+            fb.overall_sentiment, fb.rating, fb.is_acknowledged, fb.acknowledged_at, fb.created_at,
+            _giver.full_name.label("giver_name"),
+        ).outerjoin(_giver, fb.giver_id == _giver.id)
+
+    columns = {"id": fb.id, "created_at": fb.created_at}
+    for name in projection.fields:
+        if name == "giver":
+            columns["giver_id"] = fb.giver_id
+            columns["giver_name"] = _giver.full_name.label("giver_name")
+        elif name in _TEXT_FIELDS and projection.preview_chars:
+            # One character more than shown tells the serializer whether it was cut
+            columns[name] = func.substr(getattr(fb, name), 1, projection.preview_chars + 1).label(name)
+        else:
+            columns[name] = getattr(fb, name)
+    query = select(*columns.values())
+    if "giver" in projection.fields:
+        query = query.outerjoin(_giver, fb.giver_id == _giver.id)
+    return query
+
+
+def feedback_out_row(row: Row) -> dict:
+    """FeedbackOut-shaped dict; datetimes and enums are left for the JSON encoder."""
+    return {
+        "id": row.id,
+        "giver_id": row.giver_id,
+        "receiver_id": row.receiver_id,
+        "strengths": row.strengths,
+        "areas_to_improve": row.areas_to_improve,
+        "overall_sentiment": row.overall_sentiment,
+        "rating": row.rating,
+        "is_acknowledged": row.is_acknowledged,
+        "acknowledged_at": row.acknowledged_at,
+        "created_at": row.created_at,
+        "giver": {"id": row.giver_id, "full_name": row.giver_name or "Unknown"},
+    }
+
+
+def feedback_row_serializer(projection: FeedbackProjection) -> Callable[[Row], dict]:
+    """Row -> dict for a feedback_out_query(projection) select."""
+    if projection.is_full:
+        return feedback_out_row
+    fields, limit = projection.fields, projection.preview_chars
+
+    def to_dict(row: Row) -> dict:
+        out = {}
+        truncated = False
+        for name in fields:
+            if name == "giver":
+                out["giver"] = {"id": row.giver_id, "full_name": row.giver_name or "Unknown"}
+            elif limit and name in _TEXT_FIELDS:
+                text = getattr(row, name)
+                if len(text) > limit:
+                    text = text[:limit].rstrip() + _ELLIPSIS
+                    truncated = True
+                out[name] = text
+            else:
+                out[name] = getattr(row, name)
+        if limit:
+            # Fetch GET /api/feedback/{id} for the full text when set
+            out["truncated"] = truncated
+        return out
+
+    return to_dict
+
+
+@dataclass
+class FeedbackListParams:
+    limit: int
+    cursor: Optional[Tuple[datetime, int]] = None
+    sentiment: Optional[FeedbackSentiment] = None
+    acknowledged: Optional[bool] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    giver_id: Optional[int] = None
+
+
+def encode_cursor(created_at: datetime, feedback_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{feedback_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, feedback_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(feedback_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+# FastAPI dependency for the page size and filters, for routes with their own cursor format
+def feedback_filter_params(
+    limit: int = Query(config.FEEDBACK_PAGE_SIZE, ge=1, le=config.FEEDBACK_MAX_PAGE_SIZE),
+    sentiment: Optional[FeedbackSentiment] = None,
+    acknowledged: Optional[bool] = None,
+    since: Optional[datetime] = Query(None, description="Only feedback created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only feedback created before this time"),
+    giver_id: Optional[int] = None,
+) -> FeedbackListParams:
+    return FeedbackListParams(
+        limit=limit,
+        sentiment=sentiment,
+        acknowledged=acknowledged,
+        since=since,
+        until=until,
+        giver_id=giver_id,
+    )
+
+
+# FastAPI dependency shared by every feedback list route
+def feedback_list_params(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    params: FeedbackListParams = Depends(feedback_filter_params),
+) -> FeedbackListParams:
+    params.cursor = decode_cursor(cursor) if cursor else None
+    return params
+
+
+def feedback_list_queries(projection: FeedbackProjection, **equals) -> Tuple[Select, Select]:
+    """feedback_out_query() over live and over archived feedback, both narrowed to column == value for each keyword."""
+    return tuple(
+        feedback_out_query(projection, source).where(*(getattr(source, name) == value for name, value in equals.items()))
+        for source in (models.Feedback, models.FeedbackArchive)
+    )
+
+
+def apply_feedback_filters(query: Select, params: FeedbackListParams, source=models.Feedback) -> Select:
+    fb = source
+    if params.sentiment is not None:
+        query = query.where(fb.overall_sentiment == models.FeedbackSentiment(params.sentiment.value))
+    if params.acknowledged is not None:
+        query = query.where(fb.is_acknowledged if params.acknowledged else ~fb.is_acknowledged)
+    if params.since is not None:
+        query = query.where(fb.created_at >= params.since)
+    if params.until is not None:
+        query = query.where(fb.created_at < params.until)
+    if params.giver_id is not None:
+        query = query.where(fb.giver_id == params.giver_id)
+    return query
+
+
+async def _fetch_page(db: AsyncSession, query: Select, params: FeedbackListParams, source) -> List[Row]:
+    query = apply_feedback_filters(query, params, source)
+    if params.cursor is not None:
+        query = query.where(tuple_(source.created_at, source.id) < params.cursor)
+    # Fetch one extra row to learn whether another page exists
+    return (await db.execute(query.order_by(source.created_at.desc(), source.id.desc()).limit(params.limit + 1))).all()
+
+
+def _page_reaches_archive(rows: List[Row], params: FeedbackListParams, horizon: Optional[datetime]) -> bool:
+    if horizon is None or params.acknowledged is False:
+        return False
+    if params.since is not None and as_utc(params.since) >= horizon:
+        return False
+    # Archived rows are all older than the horizon, so a full page of live
+    # rows ending at or after it can't have any interleaved
+    return len(rows) <= params.limit or as_utc(rows[params.limit - 1].created_at) < horizon
+
+
+async def paginate_feedback(
+    db: AsyncSession, query: Select, params: FeedbackListParams, archived: Optional[Select] = None
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Apply filters, newest-first (created_at, id) ordering and the keyset cursor
+    to a feedback_out_query() select. Returns one page of rows and the cursor for the next
+    page, or None on the last page. With `archived` (the same select over
+    FeedbackArchive), pages that reach back past the archive horizon also
+    read the archive and merge the two.
+    """
+    rows = await _fetch_page(db, query, params, models.Feedback)
+    if archived is not None and _page_reaches_archive(rows, params, await archive_horizon(db)):
+        rows += await _fetch_page(db, archived, params, models.FeedbackArchive)
+        rows.sort(key=lambda row: (row.created_at, row.id), reverse=True)
+
+    if len(rows) <= params.limit:
+        return rows, None
+    rows = rows[:params.limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,123 @@
+import base64
+import binascii
+import html
+import re
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Row, Select, column, func, literal_column, table, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.services.feedback_queries import FeedbackListParams, apply_feedback_filters, feedback_out_query, feedback_out_row
+
+# Highlight markers chosen so they can't occur in stored text; the matched
+# fragments are HTML-escaped before the markers become <mark> tags
+_START, _STOP = "\x02", "\x03"
+_SNIPPET_TOKENS = 24
+
+_fts = table("feedback_fts", column("rowid"))
+_fts_name = literal_column("feedback_fts")
+_search_vector = literal_column("feedback.search_vector")
+_english = literal_column("'english'")
+
+# "quoted phrases" or bare words; everything else is dropped
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts5_query(terms: str) -> str:
+    """
+    Turn free text into a safe FTS5 expression: quoted phrases stay phrases,
+    bare words must all match, and a bare OR between terms is kept. Mirrors
+    the subset of Postgres websearch_to_tsquery() people actually type.
+    """
+    parts = []
+    for phrase, word in _TERM.findall(terms):
+        if word.upper() == "OR" and parts and parts[-1] != "OR":
+            parts.append("OR")
+            continue
+        words = re.findall(r"\w+", phrase or word)
+        if words:
+            parts.append('"' + " ".join(words) + '"')
+    if parts and parts[-1] == "OR":
+        parts.pop()
+    return " ".join(parts)
+
+
+def search_query(dialect: str, terms: str) -> Select:
+    """
+    feedback_out_query() narrowed to rows matching terms, with a relevance
+    `rank` (higher is better) and a highlighted snippet of each text field.
+    """
+    fb = models.Feedback
+    query = feedback_out_query()
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery(_english, terms)
+        options = f"StartSel={_START}, StopSel={_STOP}, MaxWords={_SNIPPET_TOKENS}, MinWords=8"
+        return query.add_columns(
+            func.ts_rank_cd(_search_vector, tsquery).label("rank"),
+            func.ts_headline(_english, fb.strengths, tsquery, options).label("strengths_highlight"),
+            func.ts_headline(_english, fb.areas_to_improve, tsquery, options).label("areas_to_improve_highlight"),
+        ).where(_search_vector.op("@@")(tsquery))
+
+    match = fts5_query(terms)
+    if not match:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word.")
+    return (
+        query.join(_fts, _fts.c.rowid == fb.id)
+        .add_columns(
+            # bm25() is lower-is-better; strengths weigh twice as much, like the Postgres A/B weights
+            (-func.bm25(_fts_name, 1.0, 0.5)).label("rank"),
+            func.snippet(_fts_name, 0, _START, _STOP, "…", _SNIPPET_TOKENS).label("strengths_highlight"),
+            func.snippet(_fts_name, 1, _START, _STOP, "…", _SNIPPET_TOKENS).label("areas_to_improve_highlight"),
+        )
+        .where(_fts_name.op("MATCH")(match))
+    )
+
+
+def _highlight(fragment: Optional[str]) -> str:
+    return html.escape(fragment or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def search_result_row(row: Row) -> dict:
+    return {
+        **feedback_out_row(row),
+        "rank": row.rank,
+        "strengths_highlight": _highlight(row.strengths_highlight),
+        "areas_to_improve_highlight": _highlight(row.areas_to_improve_highlight),
+    }
+
+
+def encode_rank_cursor(rank: float, feedback_id: int) -> str:
+    raw = f"{rank!r}|{feedback_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, feedback_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(rank), int(feedback_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+async def paginate_by_rank(
+    db: AsyncSession, query: Select, params: FeedbackListParams, cursor: Optional[Tuple[float, int]]
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Best matches first, keyset-paginated on (rank, id). Ranks round-trip
+    exactly through repr(), so the cursor comparison never skips or repeats rows.
+    """
+    fb = models.Feedback
+    rank = query.selected_columns.rank
+    query = apply_feedback_filters(query, params)
+    if cursor is not None:
+        query = query.where(tuple_(rank, fb.id) < cursor)
+
+    rows = (await db.execute(query.order_by(rank.desc(), fb.id.desc()).limit(params.limit + 1))).all()
+    if len(rows) <= params.limit:
+        return rows, None
+    rows = rows[:params.limit]
+    last = rows[-1]
+    return rows, encode_rank_cursor(last.rank, last.id)
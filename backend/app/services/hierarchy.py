@@ -0,0 +1,63 @@
+from typing import List, Optional
+
+from sqlalchemy import CTE, exists, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config, models
+
+
+def subtree_cte(root_id: int, max_depth: Optional[int] = None) -> CTE:
+    """
+    (id, manager_id, depth) for everyone below root_id, depth 1 being direct
+    reports. Each level is one index range scan on users.manager_id, and the
+    depth cap keeps a corrupted (cyclic) chain from recursing forever.
+    """
+    users = models.User
+    limit = min(max_depth or config.ORG_MAX_DEPTH, config.ORG_MAX_DEPTH)
+    tree = (
+        select(users.id, users.manager_id, literal(1).label("depth"))
+        .where(users.manager_id == root_id)
+        .cte("subtree", recursive=True)
+    )
+    return tree.union_all(
+        select(users.id, users.manager_id, (tree.c.depth + 1).label("depth"))
+        .join(tree, users.manager_id == tree.c.id)
+        .where(tree.c.depth < limit)
+    )
+
+
+def ancestors_cte(user_id: int) -> CTE:
+    """(id, depth) up the management chain of user_id, depth 1 being their manager."""
+    users = models.User
+    chain = (
+        select(users.manager_id.label("id"), literal(1).label("depth"))
+        .where(users.id == user_id, users.manager_id.is_not(None))
+        .cte("ancestors", recursive=True)
+    )
+    return chain.union_all(
+        select(users.manager_id, (chain.c.depth + 1).label("depth"))
+        .join(chain, users.id == chain.c.id)
+        .where(users.manager_id.is_not(None), chain.c.depth < config.ORG_MAX_DEPTH)
+    )
+
+
+def subtree_member_ids(root_id: int):
+    """Subquery of user ids below root_id, for use in IN (...) filters."""
+    tree = subtree_cte(root_id)
+    return select(tree.c.id)
+
+
+async def is_in_subtree(db: AsyncSession, root_id: int, user_id: int) -> bool:
+    """Whether user_id reports to root_id at any depth. Walks up one chain, so cost is O(depth)."""
+    chain = ancestors_cte(user_id)
+    return bool(await db.scalar(select(exists().where(chain.c.id == root_id))))
+
+
+async def would_create_cycle(db: AsyncSession, user_id: int, new_manager_id: int) -> bool:
+    return new_manager_id == user_id or await is_in_subtree(db, user_id, new_manager_id)
+
+
+async def subtree_manager_ids(db: AsyncSession, root_id: int) -> List[int]:
+    """root_id plus every manager below it who has reports of their own."""
+    tree = subtree_cte(root_id)
+    return list((await db.scalars(select(tree.c.manager_id).distinct())).all())
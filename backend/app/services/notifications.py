@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, Optional, Set
+
+from fastapi import HTTPException
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One open stream. The queue is bounded: when a client stops reading, newer
+    events replace its backlog with a single "resync" event instead of growing
+    without limit, and the client refetches once it catches up.
+    """
+
+    def __init__(self, user_id: int, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def offer(self, event: dict) -> bool:
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+            self.overflowed = True
+            return False
+
+    async def next_event(self) -> dict:
+        event = await self.queue.get()
+        if event["type"] == "resync":
+            self.overflowed = False
+        return event
+
+
+class LocalNotificationBackend:
+    """Single-process fan-out: a publish is delivered straight to this worker's subscribers."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[int, dict], None]] = None
+
+    def start(self, deliver: Callable[[int, dict], None]) -> None:
+        self._deliver = deliver
+
+    async def publish(self, user_id: int, event: dict) -> None:
+        if self._deliver:
+            self._deliver(user_id, event)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisNotificationBackend:
+    """
+    Cross-worker fan-out over one Redis pub/sub channel. Every worker listens
+    and delivers to whichever of its own streams belong to the user, so a
+    write on one worker reaches a dashboard connected to another.
+    """
+
+    def __init__(self, url: str, channel: str = "feedforward:notifications"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.channel = channel
+        self._listener: Optional[asyncio.Task] = None
+
+    def start(self, deliver: Callable[[int, dict], None]) -> None:
+        if self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self._listen(deliver))
+
+    async def _listen(self, deliver: Callable[[int, dict], None]) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            payload = json.loads(message["data"])
+                            deliver(payload["user_id"], payload["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification listener lost its Redis connection; reconnecting")
+                await asyncio.sleep(1)
+
+    async def publish(self, user_id: int, event: dict) -> None:
+        await self._redis.publish(self.channel, json.dumps({"user_id": user_id, "event": event}))
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+
+class NotificationBroker:
+    def __init__(self, backend, max_connections: int, max_per_user: int, max_queue: int):
+        self.backend = backend
+        self.max_connections = max_connections
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self.connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def admit(self, user_id: int) -> Subscription:
+        """
+        Check the limits and register the stream in one synchronous step, so
+        concurrent requests can't all pass the check before any of them
+        counts. Called while the response status can still be set; the
+        caller must release() the subscription when the response ends,
+        whether or not its body ever started.
+        """
+        if self.connections >= self.max_connections:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Too many open notification streams.", headers={"Retry-After": "30"})
+        if len(self._subscribers.get(user_id, ())) >= self.max_per_user:
+            self.rejected += 1
+            raise HTTPException(status_code=429, detail="Too many notification streams open for this user.")
+        self.backend.start(self._deliver)
+        subscription = Subscription(user_id, self.max_queue)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        self.connections += 1
+        return subscription
+
+    def release(self, subscription: Subscription) -> None:
+        """Free an admitted stream's slot; safe to call more than once."""
+        streams = self._subscribers.get(subscription.user_id)
+        if not streams or subscription not in streams:
+            return
+        streams.discard(subscription)
+        self.connections -= 1
+        if not streams:
+            self._subscribers.pop(subscription.user_id, None)
+
+    async def publish(self, user_id: Optional[int], event: dict) -> None:
+        """Called after a commit; never lets a notification failure fail the write."""
+        if user_id is None:
+            return
+        self.published += 1
+        try:
+            await self.backend.publish(user_id, event)
+        except Exception:
+            logger.exception("Failed to publish %s for user %s", event.get("type"), user_id)
+
+    def _deliver(self, user_id: int, event: dict) -> None:
+        for subscription in self._subscribers.get(user_id, ()):
+            if subscription.offer(event):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "users": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+def _make_backend():
+    if config.REDIS_URL:
+        return RedisNotificationBackend(config.REDIS_URL)
+    return LocalNotificationBackend()
+
+
+notifications = NotificationBroker(
+    _make_backend(),
+    max_connections=config.NOTIFY_MAX_CONNECTIONS,
+    max_per_user=config.NOTIFY_MAX_PER_USER,
+    max_queue=config.NOTIFY_QUEUE_SIZE,
+)
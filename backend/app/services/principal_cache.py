@@ -0,0 +1,107 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app import config, models
+
+# Columns kept for the authenticated principal. The password hash is
+# deliberately left out so it never lands in a shared cache.
+PRINCIPAL_FIELDS = ("id", "username", "full_name", "role", "manager_id")
+
+
+class LocalPrincipalBackend:
+    """In-process TTL + LRU store. Each worker has its own copy, so an entry
+    changed through another worker can be stale for at most the TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisPrincipalBackend:
+    """Shared store for multi-worker deployments; invalidations are seen by
+    every worker immediately."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "principal:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: dict) -> None:
+        await self._redis.set(self.prefix + key, json.dumps(value), px=int(self.ttl * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+
+class PrincipalCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, username: str) -> Optional[models.User]:
+        snapshot = await self.backend.get(username)
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Detached, read-only stand-in for the row; never add it to a session
+        return models.User(**{**snapshot, "role": models.UserRole(snapshot["role"])})
+
+    async def put(self, user: models.User) -> None:
+        snapshot = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        snapshot["role"] = models.UserRole(snapshot["role"]).value
+        await self.backend.set(user.username, snapshot)
+
+    async def invalidate(self, *usernames: str) -> None:
+        for username in usernames:
+            self.invalidations += 1
+            await self.backend.delete(username)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+        if isinstance(self.backend, LocalPrincipalBackend):
+            stats["size"] = len(self.backend)
+        return stats
+
+
+def _make_backend():
+    if config.REDIS_URL:
+        return RedisPrincipalBackend(config.REDIS_URL, config.PRINCIPAL_CACHE_TTL_SECONDS)
+    return LocalPrincipalBackend(config.PRINCIPAL_CACHE_MAX_SIZE, config.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+principal_cache = PrincipalCache(_make_backend())
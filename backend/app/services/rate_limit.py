@@ -0,0 +1,116 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from fastapi import HTTPException, Request
+
+from app import config
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTokenBuckets:
+    """Per-worker buckets; each uvicorn worker enforces its own share of the limit."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Spend one token; returns 0 on success, otherwise seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / refill_per_second
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+# Refill and spend in one round trip; Redis' clock keeps workers consistent
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisTokenBuckets:
+    """Buckets shared by every worker, so the configured rate is the service-wide rate."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+        self.prefix = prefix
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        return float(await self._take(keys=[self.prefix + key], args=[capacity, refill_per_second]))
+
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+    return request.client.host if request.client else "unknown"
+
+
+class AuthRateLimiter:
+    """
+    Token buckets checked before any DB lookup or bcrypt work, so a burst
+    of sign-in attempts is turned away for the cost of a dict (or Redis) hit.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def _take(self, limit: str, key: str, per_minute: int) -> None:
+        if per_minute <= 0:
+            return
+        try:
+            wait = await self.backend.take(f"{limit}:{key}", per_minute, per_minute / 60)
+        except Exception:
+            # A limiter outage must not lock everyone out
+            logger.exception("Rate limit check failed for %s", limit)
+            return
+        if wait > 0:
+            registry.count_auth_rejection(limit)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts. Please retry later.",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    async def check_login(self, request: Request, username: str) -> None:
+        await self._take("login_ip", client_ip(request), config.LOGIN_RATE_PER_IP)
+        await self._take("login_username", username.strip().lower(), config.LOGIN_RATE_PER_USERNAME)
+
+    async def check_register(self, request: Request) -> None:
+        await self._take("register_ip", client_ip(request), config.REGISTER_RATE_PER_IP)
+
+
+def _make_backend():
+    if config.REDIS_URL:
+        return RedisTokenBuckets(config.REDIS_URL)
+    return LocalTokenBuckets()
+
+
+auth_limiter = AuthRateLimiter(_make_backend())
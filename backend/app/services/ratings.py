@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+AGGREGATE_COLUMNS = ("rating_sum", "rating_count", "positive_count", "neutral_count", "negative_count")
+
+SENTIMENT_COLUMNS = {
+    models.FeedbackSentiment.POSITIVE: "positive_count",
+    models.FeedbackSentiment.NEUTRAL: "neutral_count",
+    models.FeedbackSentiment.NEGATIVE: "negative_count",
+}
+
+_users = models.User.__table__
+
+# One UPDATE for any number of users; executed as an executemany so a batch
+# of deltas costs a single round trip.
+_apply_delta_stmt = (
+    update(_users)
+    .where(_users.c.id == bindparam("b_user_id"))
+    .values({
+        **{col: _users.c[col] + bindparam(f"b_{col}") for col in AGGREGATE_COLUMNS},
+        "version": _users.c.version + 1,
+    })
+)
+
+
+def feedback_delta(rating: int, sentiment, sign: int = 1) -> Dict[str, int]:
+    """Contribution of a single feedback row to its receiver's aggregates."""
+    delta = dict.fromkeys(AGGREGATE_COLUMNS, 0)
+    delta["rating_sum"] = sign * rating
+    delta["rating_count"] = sign
+    delta[SENTIMENT_COLUMNS[models.FeedbackSentiment(sentiment)]] += sign
+    return delta
+
+
+def change_delta(old_rating: int, old_sentiment, new_rating: int, new_sentiment) -> Optional[Dict[str, int]]:
+    """Delta for an edited feedback row, or None if nothing aggregated changed."""
+    removed = feedback_delta(old_rating, old_sentiment, sign=-1)
+    added = feedback_delta(new_rating, new_sentiment)
+    delta = {col: removed[col] + added[col] for col in AGGREGATE_COLUMNS}
+    return delta if any(delta.values()) else None
+
+
+def merge_deltas(pairs: Iterable) -> Dict[int, Dict[str, int]]:
+    """Fold (user_id, delta) pairs into a single delta per user."""
+    merged: Dict[int, Dict[str, int]] = {}
+    for user_id, delta in pairs:
+        total = merged.setdefault(user_id, dict.fromkeys(AGGREGATE_COLUMNS, 0))
+        for col in AGGREGATE_COLUMNS:
+            total[col] += delta[col]
+    return merged
+
+
+async def apply_rating_deltas(db: AsyncSession, deltas: Dict[int, Dict[str, int]]) -> None:
+    """
+    Add the given per-user deltas to the stored aggregates inside the caller's
+    transaction. The increment happens in SQL, so concurrent writers never
+    overwrite each other's counts. Also bumps each user's version. Rows are updated in user id order, so two transactions
+    touching the same users lock them in the same order and can't deadlock.
+    """
+    params = [
+        {"b_user_id": user_id, **{f"b_{col}": delta[col] for col in AGGREGATE_COLUMNS}}
+        for user_id, delta in sorted(deltas.items())
+        if any(delta.values())
+    ]
+    if params:
+        await db.execute(_apply_delta_stmt, params)
@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+
+from fastapi import Depends
+
+from app import config, models
+from app.database import replicas
+from app.middleware.auth import get_current_user, get_optional_user
+
+
+class LocalRecentWrites:
+    """Per-worker record of users whose data changed in the last few seconds."""
+
+    def __init__(self, ttl: float, max_size: int = 100_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._until: "OrderedDict[int, float]" = OrderedDict()
+
+    async def add(self, user_ids: Iterable[int]) -> None:
+        until = time.monotonic() + self.ttl
+        for user_id in user_ids:
+            self._until[user_id] = until
+            self._until.move_to_end(user_id)
+        # Oldest marks sit at the front; expired ones are only ever dropped from there
+        while self._until and (len(self._until) > self.max_size or next(iter(self._until.values())) < time.monotonic()):
+            self._until.popitem(last=False)
+
+    async def contains(self, user_id: int) -> bool:
+        return self._until.get(user_id, 0.0) >= time.monotonic()
+
+
+class RedisRecentWrites:
+    """Shared between workers, so the next read lands on the primary whichever worker serves it."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "recent-write:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def add(self, user_ids: Iterable[int]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.set(f"{self.prefix}{user_id}", 1, px=int(self.ttl * 1000))
+            await pipe.execute()
+
+    async def contains(self, user_id: int) -> bool:
+        return bool(await self._redis.exists(f"{self.prefix}{user_id}"))
+
+
+def _make_backend():
+    if config.REDIS_URL:
+        return RedisRecentWrites(config.REDIS_URL, config.DB_REPLICA_STICKY_SECONDS)
+    return LocalRecentWrites(config.DB_REPLICA_STICKY_SECONDS)
+
+
+recent_writes = _make_backend()
+
+
+async def mark_written(*user_ids: Optional[int]) -> None:
+    """Called after a commit with everyone whose views changed (writer included)."""
+    if replicas.replicas:
+        await recent_writes.add({user_id for user_id in user_ids if user_id is not None})
+
+
+@asynccontextmanager
+async def read_session(user_id: Optional[int]):
+    """
+    A replica session, or the primary while `user_id` has a recent write:
+    replica lag must never hide a user's own write, or one made to their
+    data. Signed-out readers (None) have nothing to see and use a replica.
+    """
+    primary = bool(replicas.replicas) and user_id is not None and await recent_writes.contains(user_id)
+    async with replicas.session(primary=primary) as db:
+        yield db
+
+
+async def get_read_db(current_user: models.User = Depends(get_current_user)):
+    async with read_session(current_user.id) as db:
+        yield db
+
+
+async def get_public_read_db(current_user: Optional[models.User] = Depends(get_optional_user)):
+    async with read_session(current_user.id if current_user else None) as db:
+        yield db
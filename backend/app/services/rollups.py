@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, Select, case, cast, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.services.ratings import AGGREGATE_COLUMNS, SENTIMENT_COLUMNS
+
+GRAINS = ("day", "week")
+
+_rollups = models.RatingRollup.__table__
+_KEY = ("user_id", "grain", "period_start")
+
+
+def period_start(moment: datetime | date, grain: str) -> date:
+    """The UTC day, or the Monday of the ISO week, that `moment` falls in."""
+    if isinstance(moment, datetime):
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+        moment = moment.date()
+    return moment - timedelta(days=moment.weekday()) if grain == "week" else moment
+
+
+def _upsert_stmt(dialect: str):
+    stmt = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(_rollups)
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEY),
+        set_={col: _rollups.c[col] + stmt.excluded[col] for col in AGGREGATE_COLUMNS},
+    )
+
+
+async def apply_rollup_deltas(db: AsyncSession, changes: Iterable[Tuple[int, datetime, Dict[str, int]]]) -> None:
+    """
+    Add (receiver_id, feedback created_at, ratings delta) contributions to the
+    receiver's day and week buckets inside the caller's transaction. Buckets
+    are merged first and written with one executemany upsert that increments
+    in SQL, so concurrent writers never overwrite each other. Buckets are
+    written in key order, so writers sharing buckets can't deadlock.
+    """
+    merged: Dict[tuple, Dict[str, int]] = {}
+    for user_id, created_at, delta in changes:
+        for grain in GRAINS:
+            total = merged.setdefault((user_id, grain, period_start(created_at, grain)), dict.fromkeys(AGGREGATE_COLUMNS, 0))
+            for col in AGGREGATE_COLUMNS:
+                total[col] += delta[col]
+    rows = [dict(zip(_KEY, key), **total) for key, total in sorted(merged.items()) if any(total.values())]
+    if rows:
+        await db.execute(_upsert_stmt(db.bind.dialect.name), rows)
+
+
+def bucket_expression(dialect: str, grain: str, column):
+    """SQL equivalent of period_start(), for set-based rebuilds."""
+    if dialect == "postgresql":
+        return cast(func.date_trunc(grain, func.timezone("UTC", column)), Date)
+    # SQLite stores UTC timestamps as text; 'weekday 0' moves to Sunday, then back to Monday
+    return func.date(column, "weekday 0", "-6 days") if grain == "week" else func.date(column)
+
+
+def rebuild(conn: Connection, user_ids: Optional[Sequence[int]] = None) -> int:
+    """
+    Recompute rollups from live and archived feedback (for everyone, or just
+    `user_ids`) inside the caller's transaction. Returns rows written.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # Feedback writers wait until the rebuilt totals commit, so no delta
+        # can land between the delete and the recomputation
+        conn.exec_driver_sql("LOCK TABLE feedback IN SHARE MODE")
+
+    delete = _rollups.delete()
+    if user_ids is not None:
+        delete = delete.where(_rollups.c.user_id.in_(user_ids))
+    conn.execute(delete)
+
+    written = 0
+    for table in (models.Feedback.__table__, models.FeedbackArchive.__table__):
+        for grain in GRAINS:
+            bucket = bucket_expression(dialect, grain, table.c.created_at)
+            totals = {
+                "rating_sum": func.sum(table.c.rating),
+                "rating_count": func.count(),
+                **{
+                    col: func.sum(case((table.c.overall_sentiment == sentiment, 1), else_=0))
+                    for sentiment, col in SENTIMENT_COLUMNS.items()
+                },
+            }
+            query = select(
+                table.c.receiver_id, literal(grain), bucket, *(totals[col] for col in AGGREGATE_COLUMNS)
+            ).group_by(table.c.receiver_id, bucket)
+            if user_ids is not None:
+                query = query.where(table.c.receiver_id.in_(user_ids))
+            # Archived totals fold into the buckets live feedback already wrote
+            written += conn.execute(_upsert_stmt(dialect).from_select([*_KEY, *AGGREGATE_COLUMNS], query)).rowcount
+    return written
+
+
+def trend_query(grain: str, since: date, until: date, user_id: Optional[int] = None, manager_id: Optional[int] = None) -> Select:
+    """Per-period totals for one person, or summed over a manager's direct reports."""
+    r = models.RatingRollup
+    query = select(r.period_start, *(func.sum(getattr(r, col)).label(col) for col in AGGREGATE_COLUMNS)).where(
+        r.grain == grain,
+        r.period_start >= period_start(since, grain),
+        r.period_start <= until,
+    )
+    if manager_id is not None:
+        query = query.where(r.user_id.in_(select(models.User.id).where(models.User.manager_id == manager_id)))
+    else:
+        query = query.where(r.user_id == user_id)
+    return query.group_by(r.period_start).order_by(r.period_start)
+
+
+def trend_point(row) -> dict:
+    return {
+        "period_start": row.period_start,
+        "rating_count": row.rating_count,
+        "average_rating": round(row.rating_sum / row.rating_count, 2) if row.rating_count else None,
+        "positive_count": row.positive_count,
+        "neutral_count": row.neutral_count,
+        "negative_count": row.negative_count,
+    }
@@ -0,0 +1,183 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config, models
+
+RATINGS = range(1, 6)
+# Teams computed per query, keeping IN (...) lists well under driver bind limits
+_BATCH_TEAMS = 500
+
+
+@dataclass
+class MemberStats:
+    user_id: int
+    full_name: str
+    rating_histogram: Dict[int, int] = field(default_factory=lambda: dict.fromkeys(RATINGS, 0))
+    sentiment: Dict[str, int] = field(default_factory=lambda: {s.value: 0 for s in models.FeedbackSentiment})
+    unacknowledged: int = 0
+    last_feedback_at: Optional[datetime] = None
+
+    def add(self, rating: int, sentiment, count: int = 1) -> None:
+        self.rating_histogram[rating] += count
+        self.sentiment[models.FeedbackSentiment(sentiment).value] += count
+
+    def to_dict(self) -> dict:
+        count = sum(self.rating_histogram.values())
+        return {
+            "user_id": self.user_id,
+            "full_name": self.full_name,
+            "feedback_count": count,
+            "average_rating": round(sum(r * n for r, n in self.rating_histogram.items()) / count, 2) if count else None,
+            "rating_histogram": self.rating_histogram,
+            "sentiment": self.sentiment,
+            "unacknowledged": self.unacknowledged,
+            "last_feedback_at": self.last_feedback_at.isoformat() if self.last_feedback_at else None,
+        }
+
+
+async def compute_team_stats(db: AsyncSession, manager_ids: Iterable[int]) -> Dict[int, Dict[int, MemberStats]]:
+    """
+    Stats for one or more teams, keyed by manager id. Set-based queries
+    regardless of team count: the rosters, then one GROUP BY over their live
+    feedback, plus one over archived feedback.
+    """
+    manager_ids = list(manager_ids)
+    teams: Dict[int, Dict[int, MemberStats]] = {manager_id: {} for manager_id in manager_ids}
+    members = (await db.execute(
+        select(models.User.id, models.User.full_name, models.User.manager_id)
+        .where(models.User.manager_id.in_(manager_ids))
+    )).all()
+    stats = {}
+    for user_id, full_name, manager_id in members:
+        stats[user_id] = teams[manager_id][user_id] = MemberStats(user_id, full_name)
+
+    # Archived rows still count towards the histograms, whatever the archive
+    # setting is now; they are all acknowledged
+    for fb in (models.Feedback, models.FeedbackArchive):
+        grouped = await db.execute(
+            select(
+                fb.receiver_id,
+                fb.rating,
+                fb.overall_sentiment,
+                func.count(),
+                func.sum(case((fb.is_acknowledged, 0), else_=1)),
+                func.max(fb.created_at),
+            )
+            .join(models.User, fb.receiver_id == models.User.id)
+            .where(models.User.manager_id.in_(manager_ids))
+            .group_by(fb.receiver_id, fb.rating, fb.overall_sentiment)
+        )
+        for receiver_id, rating, sentiment, count, unacknowledged, last_at in grouped:
+            member = stats.get(receiver_id)
+            if member is None:  # moved teams between the queries
+                continue
+            member.add(rating, sentiment, count)
+            member.unacknowledged += unacknowledged or 0
+            if last_at and (member.last_feedback_at is None or last_at > member.last_feedback_at):
+                member.last_feedback_at = last_at
+    return teams
+
+
+class TeamAnalyticsCache:
+    """
+    Per-manager snapshot of team stats, kept current by applying each feedback
+    write as a delta instead of recomputing. A reverse member -> manager index
+    lets write paths update the right team knowing only the receiver id.
+
+    The cache is per worker process: writes handled by another worker, and
+    the rare delta that races a concurrent recompute, are corrected when the
+    entry expires after ANALYTICS_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, max_teams: int, ttl: float):
+        self.max_teams = max_teams
+        self.ttl = ttl
+        self._teams: "OrderedDict[int, tuple]" = OrderedDict()
+        self._manager_of: Dict[int, int] = {}
+        # Bumped on every write so a snapshot computed concurrently with a
+        # write is served but not cached
+        self._writes = 0
+
+    async def get(self, db: AsyncSession, manager_id: int) -> Dict[int, MemberStats]:
+        return (await self.get_many(db, [manager_id]))[manager_id]
+
+    async def get_many(self, db: AsyncSession, manager_ids: Iterable[int]) -> Dict[int, Dict[int, MemberStats]]:
+        """Cached teams are served as-is; all the misses are computed together in one batch."""
+        now = time.monotonic()
+        teams, missing = {}, []
+        for manager_id in manager_ids:
+            entry = self._teams.get(manager_id)
+            if entry and entry[0] > now:
+                self._teams.move_to_end(manager_id)
+                teams[manager_id] = entry[1]
+            else:
+                missing.append(manager_id)
+        if not missing:
+            return teams
+
+        for start in range(0, len(missing), _BATCH_TEAMS):
+            writes_before = self._writes
+            computed = await compute_team_stats(db, missing[start:start + _BATCH_TEAMS])
+            if self._writes == writes_before:
+                for manager_id, stats in computed.items():
+                    self._store(manager_id, stats)
+            teams.update(computed)
+        return teams
+
+    def _store(self, manager_id: int, stats: Dict[int, MemberStats]) -> None:
+        self.invalidate(manager_id)
+        self._teams[manager_id] = (time.monotonic() + self.ttl, stats)
+        for member_id in stats:
+            self._manager_of[member_id] = manager_id
+        while len(self._teams) > self.max_teams:
+            evicted, (_, evicted_stats) = self._teams.popitem(last=False)
+            self._forget_members(evicted, evicted_stats)
+
+    def _member(self, receiver_id: int) -> Optional[MemberStats]:
+        self._writes += 1
+        manager_id = self._manager_of.get(receiver_id)
+        entry = self._teams.get(manager_id) if manager_id is not None else None
+        return entry[1].get(receiver_id) if entry else None
+
+    def record_created(self, receiver_id: int, rating: int, sentiment, created_at: Optional[datetime]) -> None:
+        member = self._member(receiver_id)
+        if member:
+            member.add(rating, sentiment)
+            member.unacknowledged += 1
+            if created_at and (member.last_feedback_at is None or created_at > member.last_feedback_at):
+                member.last_feedback_at = created_at
+
+    def record_updated(self, receiver_id: int, old_rating: int, old_sentiment, new_rating: int, new_sentiment) -> None:
+        member = self._member(receiver_id)
+        if member:
+            member.add(old_rating, old_sentiment, -1)
+            member.add(new_rating, new_sentiment)
+
+    def record_acknowledged(self, receiver_id: int, count: int = 1) -> None:
+        member = self._member(receiver_id)
+        if member:
+            member.unacknowledged = max(0, member.unacknowledged - count)
+
+    def invalidate(self, manager_id: Optional[int]) -> None:
+        """Drop a team whose membership changed."""
+        self._writes += 1
+        entry = self._teams.pop(manager_id, None) if manager_id is not None else None
+        if entry:
+            self._forget_members(manager_id, entry[1])
+
+    def invalidate_member(self, member_id: int) -> None:
+        self.invalidate(self._manager_of.get(member_id))
+
+    def _forget_members(self, manager_id: int, stats: Dict[int, MemberStats]) -> None:
+        for member_id in stats:
+            if self._manager_of.get(member_id) == manager_id:
+                del self._manager_of[member_id]
+
+
+team_analytics = TeamAnalyticsCache(config.ANALYTICS_CACHE_MAX_TEAMS, config.ANALYTICS_CACHE_TTL_SECONDS)
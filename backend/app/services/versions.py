@@ -0,0 +1,35 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+
+async def bump(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    """Mark users as changed inside the caller's transaction."""
+    ids = set(user_ids)
+    if ids:
+        await db.execute(
+            update(models.User)
+            .where(models.User.id.in_(ids))
+            .values(version=models.User.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def user_version(db: AsyncSession, user_id: int) -> int:
+    return await db.scalar(select(models.User.version).where(models.User.id == user_id)) or 0
+
+
+async def users_fingerprint(db: AsyncSession, manager_id: Optional[int] = None) -> tuple:
+    """
+    Cheap summary of a set of user rows: any insert, reassignment or change to
+    a member (including their ratings) alters it without loading the rows.
+    Built from columns the writes already update, so it adds no shared row
+    for every feedback write to lock.
+    """
+    query = select(func.count(), func.coalesce(func.sum(models.User.id), 0), func.coalesce(func.sum(models.User.version), 0))
+    if manager_id is not None:
+        query = query.where(models.User.manager_id == manager_id)
+    return tuple((await db.execute(query)).one())
@@ -0,0 +1,27 @@
+import hashlib
+
+from fastapi import Request, Response
+
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """
+    A 304 response when the client's If-None-Match already holds this ETag,
+    otherwise None. Weak comparison, as for any conditional GET.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def cache_headers(etag: str) -> dict:
+    # Responses are per-user; browsers may keep them but must revalidate
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -0,0 +1,22 @@
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+
+def requested_fields(raw: Optional[str], allowed: Sequence[str], always: Sequence[str] = ("id",)) -> Tuple[str, ...]:
+    """
+    Parse a `?fields=a,b` sparse fieldset into names from `allowed`, in
+    `allowed` order. `always` is added so clients can still address what
+    they fetched. Unset means every field; an unknown name is a 400.
+    """
+    if not raw:
+        return tuple(allowed)
+    names = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}",
+        )
+    names.update(always)
+    return tuple(name for name in allowed if name in names)
@@ -0,0 +1,221 @@
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import config
+from app.utils import pool_stats
+
+logger = logging.getLogger("app.slow_query")
+
+# Upper bounds in seconds, Prometheus-style (a final +Inf bucket is implied)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """Per-request accumulator, reachable from SQLAlchemy hooks through a contextvar."""
+
+    __slots__ = ("scope", "queries", "db_seconds")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class ColdStart:
+    """Boot timings for this worker; app.main resets `started` to when its import began."""
+
+    __slots__ = ("started", "ready", "first_response")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ready: Optional[float] = None
+        self.first_response: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        def since_start(at: Optional[float]) -> Optional[float]:
+            return None if at is None else round(at - self.started, 4)
+
+        return {"startup_seconds": since_start(self.ready), "first_response_seconds": since_start(self.first_response)}
+
+
+class MetricsRegistry:
+    """
+    Process-local counters. Each uvicorn worker keeps its own, so scrape
+    every worker (or run one per container) to see the whole service.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.db_queries: Dict[Tuple[str, str], int] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+        self.slow_queries = 0
+        self.auth_rejections: Dict[str, int] = {}
+        self.cold_start = ColdStart()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        self.latency.setdefault(key, Histogram()).observe(seconds)
+        self.responses[(method, route, status)] = self.responses.get((method, route, status), 0) + 1
+        self.db_queries[key] = self.db_queries.get(key, 0) + stats.queries
+        self.db_seconds[key] = self.db_seconds.get(key, 0.0) + stats.db_seconds
+
+    def count_auth_rejection(self, reason: str) -> None:
+        self.auth_rejections[reason] = self.auth_rejections.get(reason, 0) + 1
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("http_requests_in_flight", "gauge", "Requests currently being served")
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+
+        family("http_requests_total", "counter", "Responses by route template and status code")
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+        family("http_request_duration_seconds", "histogram", "Time to the end of the response body")
+        for (method, route), hist in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), hist.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {hist.total}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {hist.count}")
+
+        family("http_request_db_queries_total", "counter", "SQL statements issued while serving the route")
+        for (method, route), count in sorted(self.db_queries.items()):
+            lines.append(f'http_request_db_queries_total{{method="{method}",route="{route}"}} {count}')
+
+        family("http_request_db_seconds_total", "counter", "Time spent executing SQL while serving the route")
+        for (method, route), seconds in sorted(self.db_seconds.items()):
+            lines.append(f'http_request_db_seconds_total{{method="{method}",route="{route}"}} {seconds}')
+
+        family("db_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_MS")
+        lines.append(f"db_slow_queries_total {self.slow_queries}")
+
+        family("auth_rejected_total", "counter", "Sign-in and registration attempts turned away, by limit")
+        for reason, count in sorted(self.auth_rejections.items()):
+            lines.append(f'auth_rejected_total{{reason="{reason}"}} {count}')
+
+        for name, key, help_text in (
+            ("app_startup_seconds", "startup_seconds", "Import through the end of lifespan startup"),
+            ("app_first_response_seconds", "first_response_seconds", "Import through the first completed response"),
+        ):
+            value = self.cold_start.as_dict()[key]
+            if value is not None:
+                family(name, "gauge", help_text)
+                lines.append(f"{name} {value}")
+
+        pools = pool_stats.snapshot()
+        for name, kind, key in (
+            ("db_pool_checked_out", "gauge", "checked_out"),
+            ("db_pool_size", "gauge", "size"),
+            ("db_pool_overflow", "gauge", "overflow"),
+            ("db_pool_checkouts_total", "counter", "checkouts"),
+            ("db_pool_checkout_timeouts_total", "counter", "checkout_timeouts"),
+        ):
+            family(name, kind, f"Connection pool {key.replace('_', ' ')}")
+            for pool, stats in sorted(pools.items()):
+                if key in stats:
+                    lines.append(f'{name}{{pool="{pool}"}} {stats[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _route_label(scope: dict) -> str:
+    # The route template, never the raw path, so ids don't explode label cardinality
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: times each HTTP request through the last body chunk."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            _current.reset(token)
+            if registry.cold_start.first_response is None:
+                registry.cold_start.first_response = time.perf_counter()
+            registry.observe_request(scope["method"], _route_label(scope), status, time.perf_counter() - started, stats)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if config.SLOW_QUERY_MS is not None and elapsed * 1000 >= config.SLOW_QUERY_MS:
+        registry.slow_queries += 1
+        route = f"{stats.scope['method']} {_route_label(stats.scope)}" if stats else "-"
+        logger.warning("Slow query %.1f ms on %s: %s", elapsed * 1000, route, " ".join(statement.split())[:1000])
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
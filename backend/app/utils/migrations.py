@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def head_revisions() -> Optional[Set[str]]:
+    """Heads of the migration scripts shipped with the app, or None if they aren't deployed."""
+    if not ALEMBIC_INI.exists():
+        return None
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def database_revisions(engine) -> Set[str]:
+    """Revisions stamped in the database; empty if it was never migrated."""
+    async with engine.connect() as conn:
+        try:
+            return set((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars())
+        except DBAPIError:
+            return set()
@@ -0,0 +1,67 @@
+import time
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+# engine name -> (engine, metrics)
+_registry: Dict[str, tuple] = {}
+
+
+def instrumented_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """
+    Subclass of a queue pool that times every checkout, including time spent
+    waiting for a free slot or opening a new connection. The metrics live on
+    the class so they survive pool.recreate() on engine.dispose().
+    """
+    class InstrumentedPool(base):
+        _metrics = metrics
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                self._metrics.timeouts += 1
+                raise
+            finally:
+                self._metrics.record(time.perf_counter() - started)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def register(name: str, engine, metrics: PoolMetrics) -> None:
+    _registry[name] = (engine, metrics)
+
+
+def snapshot() -> Dict[str, dict]:
+    result = {}
+    for name, (engine, metrics) in _registry.items():
+        pool: Pool = engine.pool
+        stats = {
+            "pool_class": type(pool).__name__,
+            "checkouts": metrics.checkouts,
+            "checkout_timeouts": metrics.timeouts,
+            "checkout_wait_ms_avg": round(metrics.wait_seconds_total / metrics.checkouts * 1000, 3) if metrics.checkouts else 0.0,
+            "checkout_wait_ms_max": round(metrics.wait_seconds_max * 1000, 3),
+        }
+        # Only queue pools expose occupancy
+        if hasattr(pool, "checkedout"):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), checked_in=pool.checkedin(), overflow=max(0, pool.overflow()))
+        result[name] = stats
+    return result
@@ -1,9 +1,103 @@
+import asyncio
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app import config
+from app.utils.metrics import registry
+
+# Hashes made with a different cost are flagged by verify_and_update, which
+# lets login upgrade them transparently when BCRYPT_ROUNDS changes
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=config.BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# --- Off-loop hashing ---
+# bcrypt is pure CPU; running it in request threads lets a login burst starve
+# every other endpoint on the worker. Jobs go to a small process pool instead,
+# and once too many are pending, or the queue would take too long to drain at
+# the measured job time, we shed load rather than queue indefinitely.
+
+HASH_POOL_BUSY_DETAIL = "Too many sign-in requests in progress. Please retry shortly."
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+# Moving average of one job's CPU time, so admission tracks BCRYPT_ROUNDS and the hardware
+_job_seconds: Optional[float] = None
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: children must not inherit the event loop or open DB connections
+        _executor = ProcessPoolExecutor(
+            max_workers=config.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def projected_wait() -> float:
+    """Seconds a job submitted now would queue before a pool process picks it up."""
+    if _job_seconds is None:
+        return 0.0
+    return _pending / config.PASSWORD_HASH_WORKERS * _job_seconds
+
+async def _run_in_hash_pool(fn, *args):
+    global _pending, _job_seconds
+    wait = projected_wait()
+    if _pending >= config.PASSWORD_HASH_MAX_PENDING or (
+        config.PASSWORD_HASH_MAX_WAIT_SECONDS and wait > config.PASSWORD_HASH_MAX_WAIT_SECONDS
+    ):
+        registry.count_auth_rejection("hash_pool_busy")
+        # 429 with Retry-After, like the sign-in rate limits in app/services/rate_limit.py
+        raise HTTPException(
+            status_code=429,
+            detail=HASH_POOL_BUSY_DETAIL,
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+    _pending += 1
+    try:
+        result, seconds = await asyncio.get_running_loop().run_in_executor(_get_executor(), _timed, fn, *args)
+    finally:
+        _pending -= 1
+    _job_seconds = seconds if _job_seconds is None else 0.8 * _job_seconds + 0.2 * seconds
+    return result
+
+def pending_hash_jobs() -> int:
+    return _pending
+
+def hash_pool_stats() -> dict:
+    return {
+        "pending": _pending,
+        "job_ms_avg": round(_job_seconds * 1000, 1) if _job_seconds is not None else None,
+        "projected_wait_ms": round(projected_wait() * 1000, 1),
+    }
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_hash_pool(verify_and_update, plain_password, hashed_password)
+
+def shutdown_hash_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
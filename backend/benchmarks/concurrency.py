@@ -0,0 +1,114 @@
+"""
+Concurrent-request throughput: many clients mixing cheap /api/auth/me calls
+with large history pages, the pattern that used to exhaust the worker thread
+pool.
+
+In-process against a freshly seeded SQLite file:
+
+    python -m benchmarks.concurrency --concurrency 100 --requests 5000
+
+Against a running server (compare two revisions by starting uvicorn from each
+and pointing this at it; seed its database with benchmarks.seed first):
+
+    python -m benchmarks.concurrency --base-url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def drive(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    from benchmarks.seed import PASSWORD
+
+    # user1 is always a manager with at least one report in a benchmarks.seed dataset
+    (await client.post("/api/auth/login", json={"username": "user1", "password": PASSWORD})).raise_for_status()
+    report_ids = [member["id"] for member in (await client.get("/api/users/team")).json()]
+
+    latencies = defaultdict(list)
+    errors = 0
+    remaining = args.requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            if random.random() < args.history_ratio:
+                route, path = "history", f"/api/feedback/history/{random.choice(report_ids)}"
+                params = {"limit": args.page_size}
+            else:
+                route, path, params = "me", "/api/auth/me", None
+            started = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies[route].append((time.perf_counter() - started) * 1000)
+            errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "latency_ms": {
+            route: {
+                "p50": round(statistics.median(samples), 2),
+                "p95": round(percentile(samples, 0.95), 2),
+                "p99": round(percentile(samples, 0.99), 2),
+            }
+            for route, samples in latencies.items()
+        },
+    }
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+            return await drive(client, args)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/concurrency.db"
+    os.environ.setdefault("JWT_SECRET", "benchmark")
+    from app.database import engine
+    from app.main import app
+    from benchmarks.seed import seed
+
+    seed(engine, args.users, args.feedback_per_user)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=60) as client:
+        return await drive(client, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--history-ratio", type=float, default=0.2, help="Share of requests that fetch a history page")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--feedback-per-user", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(7)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Login throughput under CPU contention.
+
+Starts --burners busy-looping processes to simulate a loaded host, then fires
+concurrent logins at the in-process app while a probe keeps calling
+/api/auth/me. Reports completed logins per second, how many the busy hash
+pool shed and how many the rate limits throttled (under --throttle; both are
+429s), and the probe's latency, which
+shows whether other endpoints stay responsive during a login burst.
+
+    python -m benchmarks.login --logins 200 --concurrency 50 --burners 2
+    python -m benchmarks.login --logins 500 --users 5 --throttle      # with the sign-in rate limits on
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+
+def burn(stop) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(10_000))
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.database import engine
+    from app.main import app
+    from app.utils.security import HASH_POOL_BUSY_DETAIL
+    from benchmarks.seed import PASSWORD, seed
+
+    seed(engine, args.users, 1)
+    transport = httpx.ASGITransport(app=app)
+    base_url = "http://bench"
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url) as probe:
+        (await probe.post("/api/auth/login", json={"username": "user1", "password": PASSWORD})).raise_for_status()
+
+        statuses = []
+        probe_latencies = []
+        done = asyncio.Event()
+        remaining = args.logins
+
+        async def login_worker() -> None:
+            nonlocal remaining
+            async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+                while remaining > 0:
+                    remaining -= 1
+                    user_id = remaining % args.users + 1
+                    response = await client.post(
+                        "/api/auth/login", json={"username": f"user{user_id}", "password": PASSWORD}
+                    )
+                    shed = response.status_code == 429 and response.json()["detail"] == HASH_POOL_BUSY_DETAIL
+                    statuses.append("shed" if shed else response.status_code)
+
+        async def probe_loop() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await probe.get("/api/auth/me")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe_loop())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    ok = statuses.count(200)
+    return {
+        "burners": args.burners,
+        "concurrency": args.concurrency,
+        "bcrypt_rounds": int(os.environ["BCRYPT_ROUNDS"]),
+        "hash_workers": int(os.environ.get("PASSWORD_HASH_WORKERS", "2")),
+        "logins_ok": ok,
+        "logins_shed": statuses.count("shed"),
+        "logins_throttled_429": statuses.count(429),
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(ok / elapsed, 1),
+        "me_probe_ms": {
+            "p50": round(statistics.median(probe_latencies), 2),
+            "max": round(max(probe_latencies), 2),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--burners", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--throttle", action="store_true", help="Keep the per-IP/per-username sign-in limits on")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/login.db"
+    os.environ.setdefault("JWT_SECRET", "benchmark")
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    if not args.throttle:
+        # Every request comes from one client; measure the hash pool, not the limiter
+        os.environ["LOGIN_RATE_PER_IP"] = os.environ["LOGIN_RATE_PER_USERNAME"] = "0"
+
+    stop = multiprocessing.Event()
+    burners = [multiprocessing.Process(target=burn, args=(stop,), daemon=True) for _ in range(args.burners)]
+    for process in burners:
+        process.start()
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        stop.set()
+        for process in burners:
+            process.join()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Benchmark suite: seeds a synthetic org, drives the real app in-process and
+reports per-scenario latency percentiles, throughput and SQL statements per
+request as JSON.
+
+    python -m benchmarks.run                                   # temporary SQLite file
+    python -m benchmarks.run --url postgresql://localhost/bench --users 100000 --feedback-per-user 50
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --baseline before.json            # exits 1 on a regression
+
+Queries per request come from the app's own per-route instrumentation
+(app.utils.metrics), so they count exactly what each route issued. With
+--baseline, a scenario regresses when it issues more queries per request,
+or when its p95 grows by more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+# (scenario, method, route template used by app.utils.metrics)
+SCENARIOS = [
+    ("login", "POST", "/api/auth/login"),
+    ("me", "GET", "/api/auth/me"),
+    ("users_all", "GET", "/api/users/all"),
+    ("feedback_received", "GET", "/api/feedback/received"),
+    ("history", "GET", "/api/feedback/history/{user_id}"),
+    ("trends", "GET", "/api/analytics/trends/{user_id}"),
+    ("create", "POST", "/api/feedback/create"),
+    ("acknowledge", "POST", "/api/feedback/acknowledge"),
+]
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def logged_in(transport, username: str) -> httpx.AsyncClient:
+    from benchmarks.seed import PASSWORD
+
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120)
+    (await client.post("/api/auth/login", json={"username": username, "password": PASSWORD})).raise_for_status()
+    # Warm the principal cache so its one-off lookup isn't charged to the first scenario
+    (await client.get("/api/auth/me")).raise_for_status()
+    return client
+
+
+async def run_scenario(name: str, requests: int, concurrency: int, call) -> dict:
+    from app.utils.metrics import registry
+
+    method, route = next((m, r) for n, m, r in SCENARIOS if n == name)
+    queries_before = registry.db_queries.get((method, route), 0)
+    latencies, errors = [], 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await call(remaining)
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+        },
+        "queries_per_request": round((registry.db_queries.get((method, route), 0) - queries_before) / requests, 2),
+    }
+
+
+async def run_suite(args: argparse.Namespace) -> dict:
+    from sqlalchemy import select
+    from app import models
+    from app.database import engine
+    from app.main import app
+    from benchmarks.seed import PASSWORD, seed
+
+    seed(engine, args.users, args.feedback_per_user, args.depth, args.random_seed)
+    rng = random.Random(args.random_seed)
+    transport = httpx.ASGITransport(app=app)
+
+    with engine.connect() as conn:
+        report_ids = conn.execute(select(models.User.id).where(models.User.manager_id == 1)).scalars().all()
+        developers = conn.execute(
+            select(models.User.username).where(models.User.role == models.UserRole.developer).limit(args.clients)
+        ).scalars().all()
+    manager = await logged_in(transport, "user1")
+    devs = [await logged_in(transport, username) for username in developers]
+    anonymous = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120)
+
+    # Unacknowledged items per developer client, consumed by the acknowledge scenario
+    pending = []
+    for client in devs:
+        response = await client.get("/api/feedback/received", params={"acknowledged": "false", "limit": 200})
+        pending.extend((client, item["id"]) for item in response.json())
+    rng.shuffle(pending)
+
+    n, c = args.requests, args.concurrency
+    scenarios = {
+        "login": lambda i: anonymous.post(
+            "/api/auth/login", json={"username": f"user{rng.randint(1, args.users)}", "password": PASSWORD}
+        ),
+        "me": lambda i: devs[i % len(devs)].get("/api/auth/me"),
+        "users_all": lambda i: manager.get("/api/users/all"),
+        "feedback_received": lambda i: devs[i % len(devs)].get("/api/feedback/received"),
+        "history": lambda i: manager.get(f"/api/feedback/history/{rng.choice(report_ids)}"),
+        "trends": lambda i: manager.get(f"/api/analytics/trends/{rng.choice(report_ids)}", params={"grain": "day"}),
+        "create": lambda i: manager.post("/api/feedback/create", json={
+            "target_user_id": rng.choice(report_ids),
+            "strengths": "Benchmark strengths",
+            "areas_to_improve": "Benchmark areas",
+            "overall_sentiment": "positive",
+            "rating": rng.randint(1, 5),
+        }),
+        "acknowledge": lambda i: pending[i][0].post("/api/feedback/acknowledge", json={"feedback_id": pending[i][1]}),
+    }
+    requests_for = {
+        "login": min(n, args.login_requests),
+        "users_all": min(n, args.users_all_requests),
+        "acknowledge": min(n, len(pending)),
+    }
+
+    results = {}
+    for name, _, _ in SCENARIOS:
+        if args.only and name not in args.only:
+            continue
+        count = requests_for.get(name, n)
+        if count:
+            results[name] = await run_scenario(name, count, c, scenarios[name])
+
+    for client in [manager, anonymous, *devs]:
+        await client.aclose()
+    return {
+        "config": {
+            "database": engine.dialect.name,
+            "users": args.users,
+            "feedback_per_user": args.feedback_per_user,
+            "depth": args.depth,
+            "requests": n,
+            "concurrency": c,
+            "bcrypt_rounds": int(os.environ["BCRYPT_ROUNDS"]),
+        },
+        "scenarios": results,
+    }
+
+
+def regressions(result: dict, baseline: dict, tolerance: float) -> list:
+    found = []
+    for name, current in result["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if current["queries_per_request"] > previous["queries_per_request"]:
+            found.append(f"{name}: queries/request {previous['queries_per_request']} -> {current['queries_per_request']}")
+        if current["latency_ms"]["p95"] > previous["latency_ms"]["p95"] * tolerance:
+            found.append(f"{name}: p95 {previous['latency_ms']['p95']}ms -> {current['latency_ms']['p95']}ms")
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Empty database to seed (defaults to a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--feedback-per-user", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--random-seed", type=int, default=7)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=20, help="Logged-in developer sessions to rotate through")
+    parser.add_argument("--login-requests", type=int, default=100, help="Logins are bcrypt-bound; cap them separately")
+    parser.add_argument("--users-all-requests", type=int, default=50, help="/api/users/all returns every user; cap it separately")
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="Cost for the shared seed hash (production uses 12)")
+    parser.add_argument("--only", nargs="*", choices=[name for name, _, _ in SCENARIOS])
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed p95 growth factor against --baseline")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("JWT_SECRET", "benchmark")
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    # Keep warmed sessions cached for the whole run so query counts are repeatable
+    os.environ.setdefault("PRINCIPAL_CACHE_TTL_SECONDS", "3600")
+    # In-process clients share one address; the login scenario would only measure 429s
+    os.environ["LOGIN_RATE_PER_IP"] = os.environ["LOGIN_RATE_PER_USERNAME"] = "0"
+
+    result = asyncio.run(run_suite(args))
+    report = json.dumps(result, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(result, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
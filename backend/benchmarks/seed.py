@@ -0,0 +1,156 @@
+"""
+Seed a synthetic org for benchmarks and query-plan checks.
+
+    python -m benchmarks.seed --url sqlite:///bench.db --users 2000 --feedback-per-user 20
+    python -m benchmarks.seed --url postgresql://localhost/bench --users 100000 --feedback-per-user 50 --depth 5
+
+One in ten users is a manager. Managers form --depth levels under user1 and
+developers are spread evenly across the lowest level. Everyone shares one
+password hash (PASSWORD), feedback is generated and inserted in batches so
+millions of rows never sit in memory at once, and the stored rating
+aggregates and trend rollups are written once at the end.
+"""
+import argparse
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, create_engine, insert, update
+
+PASSWORD = "benchmark"
+
+# Feedback rows generated and inserted per round trip
+BATCH_SIZE = 20_000
+
+_STRENGTHS = (
+    "Thorough code review", "Clear communication in standups", "Consistent delivery",
+    "Strong ownership of incidents", "Great mentoring of new hires", "Careful test coverage",
+    "Pragmatic design decisions", "Helpful documentation",
+)
+_AREAS = (
+    "Communication with stakeholders", "Estimating larger tasks", "Sharing progress earlier",
+    "Delegating review work", "Writing design docs", "Saying no to scope creep",
+)
+
+
+def _manager_ids(users: int, depth: int, rng: random.Random) -> dict:
+    """user id -> manager id for every user, with `depth` levels of managers under user1."""
+    managers = max(1, users // 10)
+    depth = max(1, min(depth, managers))
+    if depth == 1:
+        levels = [list(range(1, managers + 1))]
+    else:
+        # Managers 2..N are split into contiguous id ranges, one per level below user1
+        levels = [[1]] + [[] for _ in range(depth - 1)]
+        for manager_id in range(2, managers + 1):
+            levels[1 + (manager_id - 2) * (depth - 1) // max(1, managers - 1)].append(manager_id)
+
+    manager_of = dict.fromkeys(levels[0])
+    for upper, level in zip(levels, levels[1:]):
+        for manager_id in level:
+            manager_of[manager_id] = rng.choice(upper)
+    leaves = levels[-1]
+    for position, user_id in enumerate(range(managers + 1, users + 1)):
+        manager_of[user_id] = leaves[position % len(leaves)]
+    return manager_of
+
+
+def seed(engine, users: int, feedback_per_user: int, depth: int = 3, random_seed: int = 7) -> None:
+    from app import models
+    from app.services import ratings, rollups
+    from app.utils.security import hash_password
+
+    # The app no longer creates tables on import; seeding targets a fresh database
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(random_seed)
+    # One real hash shared by everyone keeps seeding fast while login still works
+    hashed = hash_password(PASSWORD)
+    managers = max(1, users // 10)
+    manager_of = _manager_ids(users, depth, rng)
+
+    user_rows = [
+        {
+            "id": user_id,
+            "username": f"user{user_id}",
+            "full_name": f"User {user_id}",
+            "hashed_password": hashed,
+            "role": models.UserRole.manager if user_id <= managers else models.UserRole.developer,
+            "manager_id": manager_of[user_id],
+        }
+        for user_id in range(1, users + 1)
+    ]
+
+    sentiments = list(models.FeedbackSentiment)
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    aggregates = {}
+
+    def feedback_batches():
+        batch = []
+        for receiver_id in range(1, users + 1):
+            for _ in range(feedback_per_user):
+                batch.append({
+                    "giver_id": rng.randint(1, users),
+                    "receiver_id": receiver_id,
+                    "strengths": rng.choice(_STRENGTHS),
+                    "areas_to_improve": rng.choice(_AREAS),
+                    "overall_sentiment": rng.choice(sentiments),
+                    "rating": rng.randint(1, 5),
+                    "is_acknowledged": rng.random() < 0.8,
+                    "created_at": start + timedelta(minutes=rng.randint(0, 525600)),
+                })
+                if len(batch) >= BATCH_SIZE:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    with engine.begin() as conn:
+        for offset in range(0, len(user_rows), BATCH_SIZE):
+            conn.execute(insert(models.User.__table__), user_rows[offset:offset + BATCH_SIZE])
+        for batch in feedback_batches():
+            conn.execute(insert(models.Feedback.__table__), batch)
+            # Precompute the stored rating aggregates instead of replaying the route logic
+            for user_id, delta in ratings.merge_deltas(
+                (row["receiver_id"], ratings.feedback_delta(row["rating"], row["overall_sentiment"])) for row in batch
+            ).items():
+                totals = aggregates.setdefault(user_id, dict.fromkeys(ratings.AGGREGATE_COLUMNS, 0))
+                for column, value in delta.items():
+                    totals[column] += value
+
+        users_table = models.User.__table__
+        set_aggregates = (
+            update(users_table)
+            .where(users_table.c.id == bindparam("b_id"))
+            .values({column: bindparam(f"b_{column}") for column in ratings.AGGREGATE_COLUMNS})
+        )
+        rows = [
+            {"b_id": user_id, **{f"b_{column}": value for column, value in totals.items()}}
+            for user_id, totals in aggregates.items()
+        ]
+        for offset in range(0, len(rows), BATCH_SIZE):
+            conn.execute(set_aggregates, rows[offset:offset + BATCH_SIZE])
+        rollups.rebuild(conn)
+
+        if conn.dialect.name == "postgresql":
+            # Explicit ids bypass the serial sequence; move it past them so the app can insert users
+            conn.exec_driver_sql("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT max(id) FROM users))")
+        conn.exec_driver_sql("ANALYZE")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="Database URL to create and seed")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--feedback-per-user", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=3, help="Levels of management above developers")
+    parser.add_argument("--random-seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", args.url)
+
+    engine = create_engine(args.url)
+    seed(engine, args.users, args.feedback_per_user, args.depth, args.random_seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Serialization cost of a large feedback page.
+
+Compares the old path (ORM objects validated into FeedbackOut, run through
+jsonable_encoder and the stdlib JSON encoder) with the column-projected rows
+rendered straight through ORJSONResponse, and with the list-view projection
+(?fields=...&preview_chars=...). Database time is excluded, so this shows
+only the per-row encoding overhead; gzip_bytes is what goes over the wire
+when the client accepts gzip.
+
+    python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import parse_obj_as
+
+
+def make_rows(count: int, long_text: int = 4) -> list:
+    from app.models import FeedbackSentiment
+
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=i, giver_id=1, receiver_id=2,
+            strengths="Clear communication and steady delivery " * long_text,
+            areas_to_improve="Could share progress earlier in the sprint " * long_text,
+            overall_sentiment=random.choice(list(FeedbackSentiment)),
+            rating=random.randint(1, 5),
+            is_acknowledged=bool(i % 2),
+            acknowledged_at=now if i % 2 else None,
+            created_at=now - timedelta(minutes=i),
+            giver_name="Manager One",
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label: str, render, rows: list, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = render(rows)
+        best = min(best, time.perf_counter() - started)
+    return {
+        "path": label,
+        "best_s": round(best, 4),
+        "rows_per_s": round(len(rows) / best),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, 6)),
+    }
+
+
+def render_pydantic(rows: list) -> bytes:
+    from app.schemas.feedback import FeedbackOut
+
+    payload = [
+        {**vars(row), "giver": {"id": row.giver_id, "full_name": row.giver_name}}
+        for row in rows
+    ]
+    return JSONResponse(jsonable_encoder(parse_obj_as(List[FeedbackOut], payload))).body
+
+
+def render_orjson(rows: list) -> bytes:
+    from app.services.feedback_queries import feedback_out_row
+
+    return ORJSONResponse([feedback_out_row(row) for row in rows]).body
+
+
+def preview_rows(rows: list, preview_chars: int) -> list:
+    # What the preview query hands back: text cut to preview_chars + 1 in SQL
+    return [
+        SimpleNamespace(**{
+            **vars(row),
+            "strengths": row.strengths[:preview_chars + 1],
+            "areas_to_improve": row.areas_to_improve[:preview_chars + 1],
+        })
+        for row in rows
+    ]
+
+
+def preview_renderer(fields: str, preview_chars: int):
+    from app.services.feedback_queries import FEEDBACK_FIELDS, FeedbackProjection, feedback_row_serializer
+    from app.utils.fields import requested_fields
+
+    to_dict = feedback_row_serializer(FeedbackProjection(requested_fields(fields, FEEDBACK_FIELDS), preview_chars))
+    return lambda rows: ORJSONResponse([to_dict(row) for row in rows]).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--text-repeat", type=int, default=4, help="Sentence repeats in each text field (4 is ~170 chars)")
+    parser.add_argument("--fields", default="strengths,areas_to_improve,overall_sentiment,rating,is_acknowledged,created_at,giver")
+    parser.add_argument("--preview-chars", type=int, default=120)
+    args = parser.parse_args()
+    # The app modules build their engines on import; nothing here connects
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+    random.seed(7)
+    rows = make_rows(args.rows, args.text_repeat)
+    results = [
+        timed("pydantic+jsonable_encoder", render_pydantic, rows, args.repeat),
+        timed("projected+orjson", render_orjson, rows, args.repeat),
+        timed("preview+orjson", preview_renderer(args.fields, args.preview_chars), preview_rows(rows, args.preview_chars), args.repeat),
+    ]
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
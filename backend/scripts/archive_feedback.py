@@ -0,0 +1,67 @@
+"""
+Move old acknowledged feedback into feedback_archive, and on a partitioned
+Postgres feedback table (scripts/partition_feedback.py) create the coming
+months' partitions.
+
+    python -m scripts.archive_feedback                       # uses DATABASE_URL and FEEDBACK_ARCHIVE_AFTER_DAYS
+    python -m scripts.archive_feedback --older-than-days 730 --batch-size 2000
+    python -m scripts.archive_feedback --partitions-only
+
+Run it daily (cron, a scheduled job). Each batch commits on its own, so
+it can be stopped at any point and rerun. --older-than-days may only be
+longer than FEEDBACK_ARCHIVE_AFTER_DAYS: the app reads the archive based
+on that setting, and rows archived earlier than it expects would drop out
+of list pages.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL)")
+    parser.add_argument("--older-than-days", type=int, help="Defaults to FEEDBACK_ARCHIVE_AFTER_DAYS")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows moved per transaction")
+    parser.add_argument("--partitions-ahead", type=int, default=3, help="Months of feedback partitions kept ready")
+    parser.add_argument("--partitions-only", action="store_true", help="Only create partitions")
+    args = parser.parse_args()
+    if args.url:
+        os.environ["DATABASE_URL"] = args.url
+
+    from app import config
+    from app.database import engine
+    from app.services import feedback_archive, feedback_partitions
+
+    with engine.begin() as conn:
+        for name in feedback_partitions.ensure_partitions(conn, args.partitions_ahead):
+            print(f"Created partition {name}")
+    if args.partitions_only:
+        return 0
+
+    cutoff = feedback_archive.archive_cutoff()
+    if cutoff is None:
+        print("FEEDBACK_ARCHIVE_AFTER_DAYS is not set; nothing archived", file=sys.stderr)
+        return 1
+    if args.older_than_days is not None:
+        if args.older_than_days < config.FEEDBACK_ARCHIVE_AFTER_DAYS:
+            print(f"--older-than-days must be at least FEEDBACK_ARCHIVE_AFTER_DAYS ({config.FEEDBACK_ARCHIVE_AFTER_DAYS})", file=sys.stderr)
+            return 1
+        cutoff -= timedelta(days=args.older_than_days - config.FEEDBACK_ARCHIVE_AFTER_DAYS)
+
+    started = time.perf_counter()
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            batch = feedback_archive.archive_batch(conn, cutoff, args.batch_size)
+        moved += batch
+        if batch < args.batch_size:
+            break
+    print(f"Archived {moved} feedback rows created before {cutoff:%Y-%m-%d %H:%M} UTC in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
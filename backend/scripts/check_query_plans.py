@@ -0,0 +1,97 @@
+"""
+Check that the list routes' queries are served by the access-path indexes.
+
+Seeds a synthetic org, calls each route through the real app while capturing
+the SQL it issues, then runs EXPLAIN on the captured statement and looks for
+the expected index in the plan. Exits non-zero if any route falls back to a
+table scan.
+
+    python -m scripts.check_query_plans                       # temporary SQLite file
+    python -m scripts.check_query_plans --url postgresql://...  # an empty Postgres database
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+# (route, query params, substring identifying the route's main statement, expected index)
+CHECKS = [
+    ("/api/feedback/received", {}, "WHERE feedback.receiver_id", "ix_feedback_receiver_created"),
+    ("/api/feedback/received", {"acknowledged": "false"}, "WHERE feedback.receiver_id", "ix_feedback_receiver_unacknowledged"),
+    ("/api/feedback/given", {}, "WHERE feedback.giver_id", "ix_feedback_giver_created"),
+    ("/api/feedback/history/{report_id}", {}, "WHERE feedback.receiver_id", "ix_feedback_receiver_created"),
+    ("/api/users/team", {}, "WHERE users.manager_id", "ix_users_manager_role"),
+    ("/api/users/org", {}, "WITH RECURSIVE subtree", "ix_users_manager_role"),
+]
+
+
+async def explain(engine, statement: str, parameters) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    async with engine.connect() as conn:
+        rows = (await conn.exec_driver_sql(prefix + statement, parameters)).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+async def run_checks(args: argparse.Namespace) -> int:
+    import httpx
+    from sqlalchemy import event, select
+    from app import models
+    from app.database import async_engine, engine
+    from app.main import app
+    from benchmarks.seed import PASSWORD, seed
+
+    seed(engine, args.users, args.feedback_per_user)
+
+    # Log in as a manager and inspect one of their direct reports
+    with engine.connect() as conn:
+        manager_id, report_id = conn.execute(
+            select(models.User.manager_id, models.User.id).where(models.User.manager_id.is_not(None)).limit(1)
+        ).one()
+        username = conn.execute(select(models.User.username).where(models.User.id == manager_id)).scalar_one()
+
+    captured = []
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany: captured.append((statement, parameters)),
+    )
+
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        (await client.post("/api/auth/login", json={"username": username, "password": PASSWORD})).raise_for_status()
+        for route, params, marker, index in CHECKS:
+            captured.clear()
+            path = route.format(report_id=report_id)
+            (await client.get(path, params=params)).raise_for_status()
+            statements = [(s, p) for s, p in captured if marker in s]
+            if not statements:
+                print(f"FAIL {path} {params}: no statement matching {marker!r}")
+                failures += 1
+                continue
+            plan = await explain(async_engine, *statements[-1])
+            ok = index in plan
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {path} {params} -> {index}")
+            if not ok:
+                print("     " + plan.replace("\n", "\n     "))
+
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL to seed (defaults to a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--feedback-per-user", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{tempfile.mkdtemp()}/query_plans.db"
+    os.environ.setdefault("JWT_SECRET", "query-plan-check")
+    # Plans are read off the primary; keep every route on it
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    return asyncio.run(run_checks(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
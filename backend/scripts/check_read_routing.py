@@ -0,0 +1,128 @@
+"""
+Check that read-only routes are routed between the primary and a replica.
+
+Seeds a small org into the primary, points DATABASE_REPLICA_URLS at a
+replica and drives the real app, checking which database served each read:
+
+- a plain read goes to the replica
+- the writer and the person written about read from the primary until
+  DB_REPLICA_STICKY_SECONDS pass, then go back to the replica
+- a replica that can't be reached falls back to the primary and is skipped
+  until DB_REPLICA_RETRY_SECONDS pass
+
+    python -m scripts.check_read_routing             # two SQLite files; the replica is a copy of the seeded primary
+    python -m scripts.check_read_routing --url postgresql://.../primary --replica-url postgresql://.../replica
+
+With --replica-url the replica must already follow the primary (streaming
+replication, or a restored copy taken right after seeding).
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+STICKY_SECONDS = 1.0
+
+
+async def run_checks(args: argparse.Namespace) -> int:
+    import httpx
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from app import models
+    from app.database import engine, replicas
+    from app.main import app
+    from benchmarks.seed import PASSWORD, seed
+
+    seed(engine, args.users, args.feedback_per_user)
+    if not args.replica_url:
+        engine.dispose()
+        shutil.copyfile(engine.url.database, os.environ["DATABASE_REPLICA_URLS"][len("sqlite:///"):])
+
+    with engine.connect() as conn:
+        manager_id, report_id = conn.execute(
+            select(models.User.manager_id, models.User.id)
+            .where(models.User.manager_id.is_not(None), models.User.role == models.UserRole.developer)
+            .limit(1)
+        ).one()
+        manager, report = (
+            conn.execute(select(models.User.username).where(models.User.id == user_id)).scalar_one()
+            for user_id in (manager_id, report_id)
+        )
+
+    replica = replicas.replicas[0]
+    failures = 0
+
+    def check(label: str, ok: bool) -> None:
+        nonlocal failures
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}")
+
+    async def served_by(client: httpx.AsyncClient, path: str) -> str:
+        before = (replicas.primary_reads, replica.reads)
+        (await client.get(path)).raise_for_status()
+        if replicas.primary_reads > before[0]:
+            return "primary"
+        return "replica" if replica.reads > before[1] else "none"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as boss, \
+            httpx.AsyncClient(transport=transport, base_url="http://check") as dev:
+        for client, username in ((boss, manager), (dev, report)):
+            (await client.post("/api/auth/login", json={"username": username, "password": PASSWORD})).raise_for_status()
+
+        check("read goes to the replica", await served_by(boss, "/api/feedback/given") == "replica")
+        check("second read goes to the replica", await served_by(dev, "/api/feedback/received") == "replica")
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as anonymous:
+            check("signed-out manager list goes to the replica", await served_by(anonymous, "/api/users/managers") == "replica")
+
+        (await boss.post("/api/feedback/create", json={
+            "target_user_id": report_id,
+            "strengths": "Read routing check",
+            "areas_to_improve": "None",
+            "overall_sentiment": "positive",
+            "rating": 5,
+        })).raise_for_status()
+        check("writer reads from the primary after a write", await served_by(boss, "/api/feedback/given") == "primary")
+        check("receiver reads from the primary after a write", await served_by(dev, "/api/feedback/received") == "primary")
+        check("user lookup follows the same rule", await served_by(boss, f"/api/users/{report_id}") == "primary")
+        check("export follows the same rule", await served_by(boss, "/api/feedback/export") == "primary")
+
+        await asyncio.sleep(STICKY_SECONDS + 0.2)
+        check("reads return to the replica after the sticky window", await served_by(boss, "/api/feedback/given") == "replica")
+        check("export returns to the replica too", await served_by(boss, "/api/feedback/export") == "replica")
+
+        # Swap in an engine that can't connect, as if the replica host went away
+        await replica.engine.dispose()
+        unreachable = create_async_engine(f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/missing/replica.db")
+        replica.sessions = async_sessionmaker(unreachable, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        check("unreachable replica falls back to the primary", await served_by(dev, "/api/users/manager") == "primary")
+        check("unreachable replica is marked down", replica.failures == 1 and replicas.stats()["replicas"][replica.name]["down_for_seconds"] > 0)
+        check("down replica is skipped without retrying", await served_by(dev, "/api/users/manager") == "primary" and replica.failures == 1)
+
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Empty primary database to seed (defaults to a temporary SQLite file)")
+    parser.add_argument("--replica-url", help="Replica of --url (defaults to a copy of the seeded SQLite file)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--feedback-per-user", type=int, default=5)
+    args = parser.parse_args()
+    if args.url and not args.replica_url:
+        parser.error("--url needs --replica-url")
+
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{directory}/primary.db"
+    os.environ["DATABASE_REPLICA_URLS"] = args.replica_url or f"sqlite:///{directory}/replica.db"
+    os.environ["DB_REPLICA_STICKY_SECONDS"] = str(STICKY_SECONDS)
+    os.environ["DB_REPLICA_RETRY_SECONDS"] = "60"
+    os.environ.setdefault("JWT_SECRET", "read-routing-check")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    return asyncio.run(run_checks(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Convert feedback (Postgres only) into a table range-partitioned by month of
+created_at, or back with --undo.
+
+    python -m scripts.partition_feedback                     # uses DATABASE_URL
+    python -m scripts.partition_feedback --months-ahead 6
+    python -m scripts.partition_feedback --undo
+
+This is a separate step from `alembic upgrade head`, which never changes the
+table's layout. Run it on a database at the Alembic head, in a maintenance
+window: it copies the whole table in one transaction and holds an exclusive
+lock on feedback until it commits. Afterwards the daily archive job keeps
+the coming months' partitions ready (--partitions-ahead).
+"""
+import argparse
+import os
+import sys
+import time
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL)")
+    parser.add_argument("--months-ahead", type=int, default=3, help="Partitions created past the current month")
+    parser.add_argument("--undo", action="store_true", help="Turn partitioned feedback back into one table")
+    args = parser.parse_args()
+    if args.url:
+        os.environ["DATABASE_URL"] = args.url
+
+    from app.database import engine
+    from app.services import feedback_partitions
+
+    if engine.dialect.name != "postgresql":
+        print("Feedback partitioning needs Postgres", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if feedback_partitions.is_partitioned(conn) != args.undo:
+            print(f"feedback is {'not ' if args.undo else 'already '}partitioned; nothing to do")
+            return 0
+        if args.undo:
+            feedback_partitions.unpartition(conn)
+            print(f"Rebuilt feedback as one table in {time.perf_counter() - started:.2f}s")
+        else:
+            created = feedback_partitions.partition(conn, args.months_ahead)
+            print(f"Partitioned feedback into {len(created)} tables in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
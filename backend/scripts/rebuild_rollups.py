@@ -0,0 +1,35 @@
+"""
+Rebuild the rating trend rollups from live and archived feedback.
+
+    python -m scripts.rebuild_rollups                  # everyone, using DATABASE_URL
+    python -m scripts.rebuild_rollups --user-id 12 --user-id 40
+    python -m scripts.rebuild_rollups --url postgresql://.../feedforward
+
+Writes keep the rollups current on their own; this backfills after a bulk
+import or repairs drift. On Postgres the rebuild holds a SHARE lock on
+feedback, so feedback writes wait for it to finish.
+"""
+import argparse
+import os
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL)")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Only rebuild these receivers")
+    args = parser.parse_args()
+    if args.url:
+        os.environ["DATABASE_URL"] = args.url
+
+    from app.database import engine
+    from app.services import rollups
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        written = rollups.rebuild(conn, args.user_ids)
+    print(f"Rebuilt {written} rollup rows in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
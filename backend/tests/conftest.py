@@ -0,0 +1,165 @@
+"""
+Every test gets an empty temporary SQLite database and a freshly started
+app with the per-worker caches cleared. Settings are read from the
+environment when app is imported, so they are set first.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="feedforward-tests-")
+DATABASE_PATH = os.path.join(_tmp, "test.db")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATABASE_PATH}",
+    "JWT_SECRET": "test-secret",
+    "ENV": "test",
+    "BCRYPT_ROUNDS": "4",
+    "SCHEMA_CHECK": "off",
+    "DB_CREATE_ALL": "false",
+    "DATABASE_REPLICA_URLS": "",
+    "REDIS_URL": "",
+    # Tests that exercise throttling set their own limits
+    "LOGIN_RATE_PER_IP": "0",
+    "LOGIN_RATE_PER_USERNAME": "0",
+    "REGISTER_RATE_PER_IP": "0",
+})
+
+import httpx
+import pytest
+from sqlalchemy import event, insert
+
+from app import models
+from app.database import async_engine, engine
+from app.main import create_app
+from app.services import principal_cache, rate_limit, read_routing
+from app.services.feedback_archive import archive_extent
+from app.services.team_analytics import team_analytics
+from app.utils.security import hash_password
+
+PASSWORD = "password123"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def password_hash():
+    # One real hash for every seeded user keeps setup fast while login still works
+    return hash_password(PASSWORD)
+
+
+async def _reset_database() -> None:
+    # A new file rather than drop_all: the SQLite search index lives outside the metadata
+    await async_engine.dispose()
+    engine.dispose()
+    if os.path.exists(DATABASE_PATH):
+        os.remove(DATABASE_PATH)
+    models.Base.metadata.create_all(bind=engine)
+
+
+def _reset_caches() -> None:
+    principal_cache.principal_cache.backend = principal_cache._make_backend()
+    rate_limit.auth_limiter.backend = rate_limit._make_backend()
+    read_routing.recent_writes = read_routing._make_backend()
+    team_analytics._teams.clear()
+    team_analytics._manager_of.clear()
+    archive_extent.reset()
+
+
+@pytest.fixture
+async def app(anyio_backend):
+    await _reset_database()
+    _reset_caches()
+    application = create_app()
+    async with application.router.lifespan_context(application):
+        yield application
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def login(app):
+    """login(username) -> a client holding that user's session cookie."""
+    clients = []
+
+    async def _login(username: str, password: str = PASSWORD) -> httpx.AsyncClient:
+        c = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        clients.append(c)
+        response = await c.post("/api/auth/login", json={"username": username, "password": password})
+        assert response.status_code == 200, response.text
+        return c
+
+    yield _login
+    for c in clients:
+        await c.aclose()
+
+
+@pytest.fixture
+def add_users(app, password_hash):
+    """add_users({"id": 1, "username": "alice", "role": "manager"}, ...) inserts users directly."""
+
+    def _add(*users: dict) -> None:
+        rows = [
+            {
+                "full_name": user["username"].title(),
+                "hashed_password": password_hash,
+                "manager_id": None,
+                **user,
+                "role": models.UserRole(user.get("role", "developer")),
+            }
+            for user in users
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.User.__table__), rows)
+
+    return _add
+
+
+@pytest.fixture
+def add_feedback(app):
+    """add_feedback({"giver_id": 1, "receiver_id": 2, ...}, ...) inserts feedback directly."""
+
+    def _add(*items: dict) -> None:
+        rows = [
+            {
+                "strengths": "Clear code",
+                "areas_to_improve": "More tests",
+                "overall_sentiment": models.FeedbackSentiment.POSITIVE,
+                "rating": 4,
+                "is_acknowledged": False,
+                **item,
+            }
+            for item in items
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.Feedback.__table__), rows)
+
+    return _add
+
+
+class StatementCounter:
+    """Counts SQL statements the app's request-path engine executes while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def count_statements():
+    return StatementCounter
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_acknowledge_counts_once(add_users, add_feedback, login):
+    add_users(
+        {"id": 1, "username": "boss", "role": "manager"},
+        {"id": 2, "username": "dev", "manager_id": 1},
+    )
+    add_feedback({"id": 1, "giver_id": 1, "receiver_id": 2}, {"id": 2, "giver_id": 1, "receiver_id": 2})
+    boss = await login("boss")
+    dev = await login("dev")
+
+    async def unacknowledged() -> int:
+        (member,) = (await boss.get("/api/analytics/team")).json()["members"]
+        return member["unacknowledged"]
+
+    # Cache the team's stats so the acknowledgements apply as deltas
+    assert await unacknowledged() == 2
+    responses = await asyncio.gather(*(dev.post("/api/feedback/acknowledge", json={"feedback_id": 1}) for _ in range(4)))
+
+    assert sorted(response.json()["message"] for response in responses) == ["Already acknowledged"] * 3 + ["Feedback acknowledged"]
+    assert await unacknowledged() == 1
+
+
+async def test_acknowledge_checks_receiver(add_users, add_feedback, login):
+    add_users({"id": 1, "username": "giver"}, {"id": 2, "username": "receiver"})
+    add_feedback({"id": 1, "giver_id": 1, "receiver_id": 2})
+    giver = await login("giver")
+
+    assert (await giver.post("/api/feedback/acknowledge", json={"feedback_id": 1})).status_code == 403
+    assert (await giver.post("/api/feedback/acknowledge", json={"feedback_id": 99})).status_code == 404
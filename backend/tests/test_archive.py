@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app import config, models
+from app.database import engine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def org(add_users, add_feedback):
+    add_users(
+        {"id": 1, "username": "boss", "role": "manager"},
+        {"id": 2, "username": "dev", "manager_id": 1},
+    )
+    now = datetime.now(timezone.utc)
+    add_feedback(*(
+        {"id": feedback_id, "giver_id": 1, "receiver_id": 2, "strengths": "Recent review", "created_at": now - timedelta(days=feedback_id)}
+        for feedback_id in (1, 2)
+    ))
+    # Archived while FEEDBACK_ARCHIVE_AFTER_DAYS was set
+    with engine.begin() as conn:
+        conn.execute(insert(models.FeedbackArchive.__table__), [
+            {
+                "id": feedback_id, "giver_id": 1, "receiver_id": 2, "strengths": "Archived review",
+                "areas_to_improve": "None", "overall_sentiment": models.FeedbackSentiment.NEUTRAL, "rating": 3,
+                "is_acknowledged": True, "created_at": now - timedelta(days=800 + feedback_id),
+            }
+            for feedback_id in (3, 4)
+        ])
+
+
+@pytest.mark.parametrize("archive_after_days", [0, 1000])
+async def test_archived_feedback_stays_listed_when_setting_changes(org, login, monkeypatch, archive_after_days):
+    monkeypatch.setattr(config, "FEEDBACK_ARCHIVE_AFTER_DAYS", archive_after_days)
+    dev = await login("dev")
+    boss = await login("boss")
+
+    assert [item["id"] for item in (await dev.get("/api/feedback/received")).json()] == [1, 2, 3, 4]
+    assert [item["id"] for item in (await boss.get("/api/feedback/history/2")).json()] == [1, 2, 3, 4]
+
+    for scope in ("team", "subtree"):
+        export = (await boss.get("/api/feedback/export", params={"format": "ndjson", "scope": scope})).text.splitlines()
+        assert len(export) == 4
+    (member,) = (await boss.get("/api/analytics/team")).json()["members"]
+    assert member["feedback_count"] == 4
+
+
+async def test_search_flags_excluded_archive(org, login):
+    boss = await login("boss")
+
+    response = await boss.get("/api/feedback/search", params={"q": "review"})
+    assert sorted(item["id"] for item in response.json()) == [1, 2]
+    assert response.headers["x-archive-excluded"] == "true"
+
+    recent = await boss.get("/api/feedback/search", params={"q": "review", "since": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()})
+    assert "x-archive-excluded" not in recent.headers
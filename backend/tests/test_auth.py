@@ -0,0 +1,32 @@
+import pytest
+
+from app import config
+from app.utils.security import HASH_POOL_BUSY_DETAIL
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_login_throttled_with_retry_after(add_users, client, monkeypatch):
+    monkeypatch.setattr(config, "LOGIN_RATE_PER_USERNAME", 2)
+    add_users({"id": 1, "username": "dev"})
+
+    for _ in range(2):
+        response = await client.post("/api/auth/login", json={"username": "dev", "password": "wrong"})
+        assert response.status_code == 401
+
+    response = await client.post("/api/auth/login", json={"username": "dev", "password": "wrong"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    # The bucket is per username, so other accounts are unaffected
+    response = await client.post("/api/auth/login", json={"username": "someone-else", "password": "wrong"})
+    assert response.status_code == 401
+
+
+async def test_busy_hash_pool_sheds_login_with_retry_after(add_users, client, monkeypatch):
+    monkeypatch.setattr(config, "PASSWORD_HASH_MAX_PENDING", 0)
+    add_users({"id": 1, "username": "dev"})
+
+    response = await client.post("/api/auth/login", json={"username": "dev", "password": "password123"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.json()["detail"] == HASH_POOL_BUSY_DETAIL
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cursor_pages_cover_every_row_once(add_users, add_feedback, login):
+    add_users({"id": 1, "username": "giver"}, {"id": 2, "username": "receiver"})
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    # Groups of rows share a timestamp, so page boundaries fall inside ties
+    add_feedback(*(
+        {"id": feedback_id, "giver_id": 1, "receiver_id": 2, "created_at": start + timedelta(minutes=feedback_id // 4)}
+        for feedback_id in range(1, 24)
+    ))
+    receiver = await login("receiver")
+
+    seen, cursor = [], None
+    while True:
+        response = await receiver.get("/api/feedback/received", params={"limit": 5, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page) <= 5
+        seen.extend(item["id"] for item in page)
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert sorted(seen) == list(range(1, 24))
+    assert len(seen) == len(set(seen))
+    # Newest first, ties broken by id
+    assert seen == sorted(seen, reverse=True)
+
+
+async def test_bulk_create_reports_each_item(add_users, login):
+    add_users({"id": 1, "username": "giver"}, {"id": 2, "username": "receiver"})
+    giver = await login("giver")
+    item = {"strengths": "Reviews", "areas_to_improve": "Docs", "overall_sentiment": "positive", "rating": 5}
+
+    response = await giver.post("/api/feedback/bulk", json=[
+        {**item, "target_user_id": 2},
+        {**item, "target_user_id": 999},
+        {**item, "target_user_id": 2, "rating": 3, "overall_sentiment": "neutral"},
+    ])
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 1)
+    assert [result["status"] for result in body["results"]] == ["created", "failed", "created"]
+    assert body["results"][1]["error"] == "Target user not found"
+    assert [result["feedback"]["rating"] for result in body["results"] if result["feedback"]] == [5, 3]
+
+    given = (await giver.get("/api/feedback/given")).json()
+    assert len(given) == 2
+
+
+async def test_list_routes_document_sparse_and_preview_items(client):
+    schema = (await client.get("/openapi.json")).json()
+    for path in ("/api/feedback/received", "/api/feedback/given", "/api/feedback/history/{user_id}"):
+        items = schema["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["items"]
+        assert items["$ref"].endswith("/FeedbackListItem")
+    item = schema["components"]["schemas"]["FeedbackListItem"]
+    assert item["required"] == ["id"]
+    assert "truncated" in item["properties"]
@@ -0,0 +1,68 @@
+"""
+Partition conversion and upkeep. Postgres only: set TEST_POSTGRES_URL to an
+empty scratch database (its tables are dropped and recreated) to run these.
+"""
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+
+from app import models
+from app.services import feedback_partitions
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+@pytest.fixture
+def pg():
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP SCHEMA public CASCADE; CREATE SCHEMA public")
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.User.__table__), [
+            {"id": user_id, "username": f"user{user_id}", "full_name": "User", "hashed_password": "x", "role": models.UserRole.developer}
+            for user_id in (1, 2)
+        ])
+        conn.execute(insert(models.Feedback.__table__), [
+            {"id": 1, "giver_id": 1, "receiver_id": 2, "strengths": "Old", "areas_to_improve": "x",
+             "overall_sentiment": models.FeedbackSentiment.POSITIVE, "rating": 4, "created_at": datetime(2024, 3, 5, tzinfo=timezone.utc)},
+        ])
+    yield engine
+    engine.dispose()
+
+
+def _partition_of(conn, feedback_id: int) -> str:
+    return conn.execute(text("SELECT tableoid::regclass::text FROM feedback WHERE id = :id"), {"id": feedback_id}).scalar()
+
+
+def test_partition_round_trip(pg):
+    with pg.begin() as conn:
+        created = feedback_partitions.partition(conn, months_ahead=1)
+        assert "feedback_2024_03" in created and "feedback_default" in created
+        assert _partition_of(conn, 1) == "feedback_2024_03"
+    with pg.begin() as conn:
+        feedback_partitions.unpartition(conn)
+        assert not feedback_partitions.is_partitioned(conn)
+        assert _partition_of(conn, 1) == "feedback"
+
+
+def test_ensure_partitions_splits_rows_out_of_default(pg):
+    with pg.begin() as conn:
+        feedback_partitions.partition(conn, months_ahead=0)
+    month = feedback_partitions.next_month(datetime.now(timezone.utc).date().replace(day=1))
+    name = f"feedback_{month:%Y_%m}"
+    with pg.begin() as conn:
+        conn.execute(insert(models.Feedback.__table__), [{
+            "id": 2, "giver_id": 1, "receiver_id": 2, "strengths": "Early", "areas_to_improve": "x",
+            "overall_sentiment": models.FeedbackSentiment.NEUTRAL, "rating": 3,
+            "created_at": datetime(month.year, month.month, 2, tzinfo=timezone.utc),
+        }])
+        assert _partition_of(conn, 2) == "feedback_default"
+
+    with pg.begin() as conn:
+        assert feedback_partitions.ensure_partitions(conn, months_ahead=2)[0] == name
+        assert _partition_of(conn, 2) == name
+        assert conn.execute(text("SELECT count(*) FROM feedback WHERE search_vector @@ to_tsquery('early')")).scalar() == 1
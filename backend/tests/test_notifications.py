@@ -0,0 +1,43 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import ClientDisconnect
+
+from app.routers.notification_routes import _EventStreamResponse
+from app.services.notifications import LocalNotificationBackend, NotificationBroker, notifications
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_admit_counts_each_stream_before_the_next_check():
+    broker = NotificationBroker(LocalNotificationBackend(), max_connections=3, max_per_user=2, max_queue=4)
+
+    first, second = broker.admit(1), broker.admit(1)
+    with pytest.raises(HTTPException) as per_user:
+        broker.admit(1)
+    assert per_user.value.status_code == 429
+
+    broker.admit(2)
+    with pytest.raises(HTTPException) as total:
+        broker.admit(3)
+    assert total.value.status_code == 503
+    assert total.value.headers["Retry-After"] == "30"
+
+    broker.release(first)
+    broker.release(first)
+    assert broker.connections == 2
+    broker.admit(1)
+    assert broker.stats()["rejected"] == 2
+    broker.release(second)
+
+
+async def test_stream_that_never_starts_releases_its_slot(app):
+    response = _EventStreamResponse(notifications.admit(1))
+    assert notifications.connections == 1
+
+    async def gone(message):
+        raise OSError("client disconnected")
+
+    with pytest.raises(ClientDisconnect):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, None, gone)
+    assert notifications.connections == 0
+    assert notifications.stats()["users"] == 0
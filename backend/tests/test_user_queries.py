@@ -0,0 +1,39 @@
+"""The user list routes must issue the same number of statements however many users there are."""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+N = 25
+ROUTES = ("/api/users/all", "/api/users/team")
+
+
+def _reports(first_id: int, count: int) -> list:
+    return [
+        {"id": user_id, "username": f"dev{user_id}", "manager_id": 1}
+        for user_id in range(first_id, first_id + count)
+    ]
+
+
+async def _statements_per_route(manager, count_statements, team_size: int) -> dict:
+    counts = {}
+    for route in ROUTES:
+        with count_statements() as counter:
+            response = await manager.get(route)
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == (team_size + 1 if route == "/api/users/all" else team_size)
+        counts[route] = counter.count
+    return counts
+
+
+async def test_user_list_statement_count_does_not_grow_with_users(add_users, login, count_statements):
+    add_users({"id": 1, "username": "boss", "role": "manager"}, *_reports(2, N))
+    manager = await login("boss")
+    # Warm the principal cache so both measurements see the same auth path
+    await _statements_per_route(manager, count_statements, N)
+    small = await _statements_per_route(manager, count_statements, N)
+
+    add_users(*_reports(N + 2, N))
+    large = await _statements_per_route(manager, count_statements, 2 * N)
+
+    assert all(small.values())
+    assert small == large
@@ -0,0 +1,76 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_user_list_etag(add_users, login):
+    add_users(
+        {"id": 1, "username": "boss", "role": "manager"},
+        {"id": 2, "username": "dev"},
+    )
+    manager = await login("boss")
+
+    first = await manager.get("/api/users/all")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = await manager.get("/api/users/all", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    assert (await manager.put("/api/users/2/assign-manager")).status_code == 200
+
+    fresh = await manager.get("/api/users/all", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert {row["id"]: row["manager"] for row in fresh.json()}[2]["id"] == 1
+
+    # New ratings show in the list too
+    await manager.post("/api/feedback/create", json={
+        "target_user_id": 2, "strengths": "Tests", "areas_to_improve": "None", "overall_sentiment": "positive", "rating": 4,
+    })
+    rated = await manager.get("/api/users/all", headers={"If-None-Match": fresh.headers["etag"]})
+    assert rated.status_code == 200
+    assert {row["id"]: row["rating"] for row in rated.json()}[2] == 4
+
+
+async def test_user_list_revalidation_is_one_statement(add_users, login, count_statements):
+    add_users({"id": 1, "username": "boss", "role": "manager"}, *({"id": i, "username": f"dev{i}"} for i in range(2, 40)))
+    manager = await login("boss")
+    etag = (await manager.get("/api/users/all")).headers["etag"]
+
+    with count_statements() as counter:
+        response = await manager.get("/api/users/all", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert counter.count == 1
+
+
+async def test_manager_assignment_rejects_cycles(add_users, login):
+    # boss reports to dev, so dev cannot also report to boss
+    add_users(
+        {"id": 1, "username": "dev"},
+        {"id": 2, "username": "boss", "role": "manager", "manager_id": 1},
+        {"id": 3, "username": "other", "role": "manager"},
+    )
+    boss = await login("boss")
+
+    response = await boss.put("/api/users/1/assign-manager")
+    assert response.status_code == 400
+    assert "cycle" in response.json()["detail"]
+
+    response = await boss.put("/api/users/1/change-manager/2")
+    assert response.status_code == 400
+
+    dev = (await boss.get("/api/users/1")).json()
+    assert dev["manager"] is None
+    # A move that keeps the tree acyclic still goes through
+    assert (await boss.put("/api/users/1/change-manager/3")).status_code == 200
+
+
+async def test_user_lookup_and_manager_list_are_public(add_users, client):
+    add_users({"id": 1, "username": "boss", "role": "manager"}, {"id": 2, "username": "dev", "manager_id": 1})
+
+    user = await client.get("/api/users/2")
+    assert user.status_code == 200
+    assert user.json()["manager"]["id"] == 1
+    assert [manager["id"] for manager in (await client.get("/api/users/managers")).json()] == [1]
@@ -0,0 +1,37 @@
+"""Multi-row writes lock rows in key order, so concurrent bulk submissions can't deadlock."""
+import pytest
+from sqlalchemy import event
+
+from app.database import async_engine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def test_bulk_create_updates_users_and_rollups_in_key_order(add_users, login, statements):
+    add_users(*({"id": user_id, "username": f"user{user_id}"} for user_id in range(1, 6)))
+    giver = await login("user1")
+    item = {"strengths": "Reviews", "areas_to_improve": "Docs", "overall_sentiment": "positive", "rating": 4}
+    targets = [5, 2, 4, 3, 2]
+
+    response = await giver.post("/api/feedback/bulk", json=[{**item, "target_user_id": target} for target in targets])
+    assert response.json()["created"] == len(targets)
+
+    (user_params,) = [params for statement, params in statements if statement.startswith("UPDATE users SET rating_sum")]
+    assert [row[-1] for row in user_params] == [2, 3, 4, 5]
+
+    (rollup_params,) = [params for statement, params in statements if statement.startswith("INSERT INTO rating_rollups")]
+    keys = [tuple(row[:3]) for row in rollup_params]
+    assert len(keys) == 8
+    assert keys == sorted(keys)
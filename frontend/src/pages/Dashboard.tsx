@@ -34,13 +34,26 @@ interface Feedback {
   rating: number;
   created_at: string;
   is_acknowledged: boolean;
+  truncated?: boolean;
 }
 
+// Cards show a preview; the full text is fetched when a card is expanded
+const PREVIEW_CHARS = 280;
+
+// Received feedback is paged; X-Next-Cursor is set while older pages remain
+const fetchReceived = (cursor?: string | null) =>
+  axios.get(`/api/feedback/received`, {
+    params: { preview_chars: PREVIEW_CHARS, ...(cursor ? { cursor } : {}) },
+    withCredentials: true,
+  });
+
 const Dashboard = () => {
   const { user } = useAuth();
   const [manager, setManager] = useState<User | null>(null);
   const [developers, setDevelopers] = useState<User[]>([]);
   const [feedbackList, setFeedbackList] = useState<Feedback[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [feedbackLoading, setFeedbackLoading] = useState(true);
   const [tab, setTab] = useState<string>("unacknowledged");
 
@@ -52,17 +65,19 @@ const Dashboard = () => {
         if (user.role === UserRole.DEVELOPER) {
           const [managerRes, feedbackRes] = await Promise.all([
             axios.get(`/api/users/manager`, { withCredentials: true }),
-            axios.get(`/api/feedback/received`, { withCredentials: true }),
+            fetchReceived(),
           ]);
           setManager(managerRes.data.manager);
           setFeedbackList(feedbackRes.data);
+          setNextCursor(feedbackRes.headers["x-next-cursor"] ?? null);
         } else if (user.role === UserRole.MANAGER) {
           const [teamRes, feedbackRes] = await Promise.all([
             axios.get(`/api/users/team`, { withCredentials: true }),
-            axios.get(`/api/feedback/received`, { withCredentials: true }),
+            fetchReceived(),
           ]);
           setDevelopers(teamRes.data);
           setFeedbackList(feedbackRes.data);
+          setNextCursor(feedbackRes.headers["x-next-cursor"] ?? null);
         }
       } catch (err) {
         console.error("Error fetching dashboard data:", err);
@@ -74,6 +89,69 @@ const Dashboard = () => {
     fetchData();
   }, [user]);
 
+  // Live updates: feedback given to this user arrives over server-sent events
+  useEffect(() => {
+    if (!user) return;
+
+    const source = new EventSource(
+      `${axios.defaults.baseURL}/api/notifications/stream`,
+      { withCredentials: true }
+    );
+    source.addEventListener("feedback.created", (event) => {
+      const { feedback } = JSON.parse((event as MessageEvent).data);
+      setFeedbackList((prev) => [feedback, ...prev.filter((f) => f.id !== feedback.id)]);
+      toast(`New feedback from ${feedback.giver.full_name}`);
+    });
+    source.addEventListener("feedback.updated", (event) => {
+      const { feedback } = JSON.parse((event as MessageEvent).data);
+      setFeedbackList((prev) => prev.map((f) => (f.id === feedback.id ? feedback : f)));
+    });
+    // Sent when this tab fell too far behind; reload instead of replaying
+    source.addEventListener("resync", async () => {
+      const feedbackRes = await fetchReceived();
+      setFeedbackList(feedbackRes.data);
+      setNextCursor(feedbackRes.headers["x-next-cursor"] ?? null);
+    });
+
+    return () => source.close();
+  }, [user]);
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await fetchReceived(nextCursor);
+      // Skip items that arrived live while the older page was loading
+      setFeedbackList((prev) => [
+        ...prev,
+        ...res.data.filter((f: Feedback) => !prev.some((p) => p.id === f.id)),
+      ]);
+      setNextCursor(res.headers["x-next-cursor"] ?? null);
+    } catch (err) {
+      toast("Failed to load more feedback");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const renderLoadMore = () =>
+    nextCursor && (
+      <div className="flex justify-center mt-4">
+        <Button variant="outline" onClick={handleLoadMore} disabled={loadingMore}>
+          {loadingMore ? "Loading..." : "Load more"}
+        </Button>
+      </div>
+    );
+
+  const handleExpand = async (feedbackId: number) => {
+    try {
+      const res = await axios.get(`/api/feedback/${feedbackId}`, { withCredentials: true });
+      setFeedbackList((prev) => prev.map((f) => (f.id === feedbackId ? res.data : f)));
+    } catch (err) {
+      toast("Failed to load feedback");
+    }
+  };
+
   const handleAcknowledge = async (feedbackId: number) => {
     try {
       await axios.post(
@@ -141,92 +219,104 @@ const Dashboard = () => {
 
     if (filtered.length === 0) {
       return (
-        <Card>
-          <CardContent className="flex items-center justify-center py-12">
-            <div className="text-center space-y-3">
-              {acknowledged ? (
-                <CheckCircle className="h-8 w-8 mx-auto text-muted-foreground" />
-              ) : (
-                <Clock className="h-8 w-8 mx-auto text-muted-foreground" />
-              )}
-              <p className="text-muted-foreground">
-                No feedback {acknowledged ? "acknowledged" : "to acknowledge"}.
-              </p>
-            </div>
-          </CardContent>
-        </Card>
+        <>
+          <Card>
+            <CardContent className="flex items-center justify-center py-12">
+              <div className="text-center space-y-3">
+                {acknowledged ? (
+                  <CheckCircle className="h-8 w-8 mx-auto text-muted-foreground" />
+                ) : (
+                  <Clock className="h-8 w-8 mx-auto text-muted-foreground" />
+                )}
+                <p className="text-muted-foreground">
+                  No feedback {acknowledged ? "acknowledged" : "to acknowledge"}.
+                </p>
+              </div>
+            </CardContent>
+          </Card>
+          {renderLoadMore()}
+        </>
       );
     }
 
     return (
-      <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-3">
-        {filtered.map((f) => (
-          <Card key={f.id} className="hover:shadow-md transition-shadow">
-            <CardHeader className="pb-3">
-              <div className="flex items-center justify-between">
-                <CardTitle className="flex items-center gap-2 text-base">
-                  <UserIcon className="h-4 w-4" />
-                  {f.giver?.full_name || "Anonymous"}
-                </CardTitle>
-                {acknowledged && (
-                  <CheckCircle className="h-4 w-4 text-green-600 dark:text-green-400" />
-                )}
-              </div>
-              <div className="flex items-center gap-2 text-xs text-muted-foreground">
-                <Calendar className="h-3 w-3" />
-                {new Date(f.created_at).toLocaleDateString()}
-              </div>
-            </CardHeader>
-            <CardContent className="space-y-4">
-              <div className="flex items-center justify-between">
-                <div className="flex items-center gap-2">
-                  <Star className="h-4 w-4 fill-current text-amber-500" />
-                  <span className="font-medium">{f.rating}/5</span>
+      <>
+        <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-3">
+          {filtered.map((f) => (
+            <Card key={f.id} className="hover:shadow-md transition-shadow">
+              <CardHeader className="pb-3">
+                <div className="flex items-center justify-between">
+                  <CardTitle className="flex items-center gap-2 text-base">
+                    <UserIcon className="h-4 w-4" />
+                    {f.giver?.full_name || "Anonymous"}
+                  </CardTitle>
+                  {acknowledged && (
+                    <CheckCircle className="h-4 w-4 text-green-600 dark:text-green-400" />
+                  )}
                 </div>
-                <div className="flex items-center gap-2">
-                  {getSentimentIcon(f.overall_sentiment)}
-                  {getSentimentBadge(f.overall_sentiment)}
+                <div className="flex items-center gap-2 text-xs text-muted-foreground">
+                  <Calendar className="h-3 w-3" />
+                  {new Date(f.created_at).toLocaleDateString()}
                 </div>
-              </div>
-
-              <div className="space-y-3">
-                <div>
-                  <div className="flex items-center gap-2 mb-1">
-                    <TrendingUp className="h-3 w-3 text-green-600 dark:text-green-400" />
-                    <span className="text-xs font-medium text-green-700 dark:text-green-300">
-                      Strengths
-                    </span>
+              </CardHeader>
+              <CardContent className="space-y-4">
+                <div className="flex items-center justify-between">
+                  <div className="flex items-center gap-2">
+                    <Star className="h-4 w-4 fill-current text-amber-500" />
+                    <span className="font-medium">{f.rating}/5</span>
+                  </div>
+                  <div className="flex items-center gap-2">
+                    {getSentimentIcon(f.overall_sentiment)}
+                    {getSentimentBadge(f.overall_sentiment)}
                   </div>
-                  <p className="text-sm text-muted-foreground">{f.strengths}</p>
                 </div>
 
-                <div>
-                  <div className="flex items-center gap-2 mb-1">
-                    <TrendingDown className="h-3 w-3 text-orange-600 dark:text-orange-400" />
-                    <span className="text-xs font-medium text-orange-700 dark:text-orange-300">
-                      Areas to Improve
-                    </span>
+                <div className="space-y-3">
+                  <div>
+                    <div className="flex items-center gap-2 mb-1">
+                      <TrendingUp className="h-3 w-3 text-green-600 dark:text-green-400" />
+                      <span className="text-xs font-medium text-green-700 dark:text-green-300">
+                        Strengths
+                      </span>
+                    </div>
+                    <p className="text-sm text-muted-foreground">{f.strengths}</p>
                   </div>
-                  <p className="text-sm text-muted-foreground">
-                    {f.areas_to_improve}
-                  </p>
+
+                  <div>
+                    <div className="flex items-center gap-2 mb-1">
+                      <TrendingDown className="h-3 w-3 text-orange-600 dark:text-orange-400" />
+                      <span className="text-xs font-medium text-orange-700 dark:text-orange-300">
+                        Areas to Improve
+                      </span>
+                    </div>
+                    <p className="text-sm text-muted-foreground">
+                      {f.areas_to_improve}
+                    </p>
+                  </div>
+
+                  {f.truncated && (
+                    <Button variant="link" size="sm" className="px-0" onClick={() => handleExpand(f.id)}>
+                      Show more
+                    </Button>
+                  )}
                 </div>
-              </div>
 
-              {!acknowledged && (
-                <Button
-                  size="sm"
-                  onClick={() => handleAcknowledge(f.id)}
-                  className="w-full"
-                >
-                  <CheckCircle className="h-4 w-4 mr-2" />
-                  Acknowledge
-                </Button>
-              )}
-            </CardContent>
-          </Card>
-        ))}
-      </div>
+                {!acknowledged && (
+                  <Button
+                    size="sm"
+                    onClick={() => handleAcknowledge(f.id)}
+                    className="w-full"
+                  >
+                    <CheckCircle className="h-4 w-4 mr-2" />
+                    Acknowledge
+                  </Button>
+                )}
+              </CardContent>
+            </Card>
+          ))}
+        </div>
+        {renderLoadMore()}
+      </>
     );
   };
 
@@ -5,6 +5,7 @@ import axios from "@/services/api";
 import { Card, CardHeader, CardTitle, CardContent } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Separator } from "@/components/ui/separator";
+import { Button } from "@/components/ui/button";
 import { toast } from "sonner";
 import {
   History,
@@ -29,6 +30,18 @@ interface Feedback {
   overall_sentiment: "positive" | "neutral" | "negative";
   rating: number;
   created_at: string;
+  truncated?: boolean;
+}
+
+// Cards show a preview; the full text is fetched when a card is expanded
+const PREVIEW_CHARS = 280;
+
+interface FeedbackSummary {
+  feedback_count: number;
+  average_rating: number | null;
+  positive_count: number;
+  neutral_count: number;
+  negative_count: number;
 }
 
 const sentimentConfig = {
@@ -59,6 +72,9 @@ export default function FeedbackHistoryPage() {
     "id" | "full_name"
   > | null>(null);
   const [feedbackList, setFeedbackList] = useState<Feedback[]>([]);
+  // Set by the API (X-Next-Cursor) while older pages remain
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [stats, setStats] = useState({
     averageRating: 0,
@@ -66,16 +82,21 @@ export default function FeedbackHistoryPage() {
     sentimentBreakdown: { positive: 0, neutral: 0, negative: 0 },
   });
 
+  const fetchHistoryPage = (cursor?: string | null) =>
+    axios.get(`/api/feedback/history/${userId}`, {
+      params: { preview_chars: PREVIEW_CHARS, ...(cursor ? { cursor } : {}) },
+      withCredentials: true,
+    });
+
   useEffect(() => {
     async function fetchData() {
       if (!userId) return;
       setLoading(true);
       try {
-        const [userRes, feedbackRes] = await Promise.all([
+        const [userRes, feedbackRes, summaryRes] = await Promise.all([
           axios.get(`/api/users/${userId}`),
-          axios.get(`/api/feedback/history/${userId}`, {
-            withCredentials: true,
-          }),
+          fetchHistoryPage(),
+          axios.get(`/api/analytics/summary/${userId}`, { withCredentials: true }),
         ]);
 
         setTargetUser({
@@ -84,24 +105,19 @@ export default function FeedbackHistoryPage() {
         });
 
         setFeedbackList(feedbackRes.data);
+        setNextCursor(feedbackRes.headers["x-next-cursor"] ?? null);
 
-        const feedback = feedbackRes.data;
-        const totalFeedback = feedback.length;
-        const averageRating =
-          totalFeedback > 0
-            ? feedback.reduce((sum: number, f: Feedback) => sum + f.rating, 0) /
-              totalFeedback
-            : 0;
-
-        const sentimentBreakdown = feedback.reduce(
-          (acc: any, f: Feedback) => {
-            acc[f.overall_sentiment] = (acc[f.overall_sentiment] || 0) + 1;
-            return acc;
+        // Totals cover every item, not just the pages loaded so far
+        const summary: FeedbackSummary = summaryRes.data;
+        setStats({
+          averageRating: summary.average_rating ?? 0,
+          totalFeedback: summary.feedback_count,
+          sentimentBreakdown: {
+            positive: summary.positive_count,
+            neutral: summary.neutral_count,
+            negative: summary.negative_count,
           },
-          { positive: 0, neutral: 0, negative: 0 }
-        );
-
-        setStats({ averageRating, totalFeedback, sentimentBreakdown });
+        });
       } catch (err) {
         toast.error("Failed to load feedback history");
         setTargetUser(null);
@@ -112,6 +128,29 @@ export default function FeedbackHistoryPage() {
     fetchData();
   }, [userId]);
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await fetchHistoryPage(nextCursor);
+      setFeedbackList((prev) => [...prev, ...res.data]);
+      setNextCursor(res.headers["x-next-cursor"] ?? null);
+    } catch (err) {
+      toast.error("Failed to load more feedback");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleExpand = async (feedbackId: number) => {
+    try {
+      const res = await axios.get(`/api/feedback/${feedbackId}`, { withCredentials: true });
+      setFeedbackList((prev) => prev.map((f) => (f.id === feedbackId ? res.data : f)));
+    } catch (err) {
+      toast.error("Failed to load feedback");
+    }
+  };
+
   const renderStars = (rating: number) => {
     return (
       <div className="flex items-center gap-1">
@@ -246,7 +285,7 @@ export default function FeedbackHistoryPage() {
           <div className="flex items-center gap-2">
             <History className="h-5 w-5" />
             <h2 className="text-xl font-semibold">Feedback Timeline</h2>
-            <Badge variant="outline">{feedbackList.length} total</Badge>
+            <Badge variant="outline">{stats.totalFeedback} total</Badge>
           </div>
 
           {feedbackList.length === 0 ? (
@@ -320,12 +359,25 @@ export default function FeedbackHistoryPage() {
                               {feedback.areas_to_improve}
                             </p>
                           </div>
+
+                          {feedback.truncated && (
+                            <Button variant="link" size="sm" className="px-0" onClick={() => handleExpand(feedback.id)}>
+                              Show more
+                            </Button>
+                          )}
                         </div>
                       </div>
                     </CardContent>
                   </Card>
                 );
               })}
+              {nextCursor && (
+                <div className="flex justify-center">
+                  <Button variant="outline" onClick={handleLoadMore} disabled={loadingMore}>
+                    {loadingMore ? "Loading..." : "Load more"}
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </div>